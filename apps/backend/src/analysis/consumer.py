@@ -10,7 +10,8 @@ import structlog
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
-from src.message_queue.client import RabbitMQClient
+from src.message_queue.async_client import AsyncRabbitMQClient
+from src.message_queue.runtime import ConsumerRuntime
 from src.db.database import SessionLocal
 from src.analysis.service import JournalAnalysisService
 from src.llm.service import OllamaInferenceService
@@ -26,23 +27,30 @@ logging.basicConfig(
 )
 
 
-def get_dependencies():
-    """Initializes and returns dependencies for the consumer."""
+def get_dependencies(mq_client: AsyncRabbitMQClient):
+    """
+    Initializes the dependencies shared by all concurrently processed messages.
+    DB sessions are opened per message instead.
+    """
     llm_service = OllamaInferenceService()
-    analysis_service = JournalAnalysisService(llm_service)
-    prompt_generator = PromptGenerator(llm_service)
-    db_session = SessionLocal()
-    # A separate client for publishing
-    mq_client = RabbitMQClient()
     return {
-        "analysis_service": analysis_service,
-        "prompt_generator": prompt_generator,
-        "db_session": db_session,
+        "analysis_service": JournalAnalysisService(llm_service),
+        "prompt_generator": PromptGenerator(llm_service),
+        # Publishes over the consumer's own connection
         "mq_client": mq_client,
     }
 
 
-def callback(ch, method, properties, body, deps):
+def save_analysis(analysis_service: JournalAnalysisService, entry_id: UUID, analysis):
+    """Writes the analysis with a session of its own; runs in a worker thread."""
+    db: Session = SessionLocal()
+    try:
+        analysis_service.update_journal_entry_with_analysis(db, entry_id, *analysis)
+    finally:
+        db.close()
+
+
+async def callback(body: bytes, deps):
     """Callback function to process messages from the journal-analysis-queue."""
     message = {}
     entry_id = "N/A"
@@ -59,46 +67,23 @@ def callback(ch, method, properties, body, deps):
 
         analysis_service: JournalAnalysisService = deps["analysis_service"]
         prompt_generator: PromptGenerator = deps["prompt_generator"]
-        db: Session = deps["db_session"]
-        mq_client: RabbitMQClient = deps["mq_client"]
-
-        # Run the async analysis function
-        (
-            title,
-            sentiment,
-            keywords,
-            summary,
-            emotional_landscape,
-            themes_topics,
-            cognitive_patterns,
-            relational_dynamics,
-            contextual_clues,
-        ) = asyncio.run(analysis_service.analyze_entry(content))
+        mq_client: AsyncRabbitMQClient = deps["mq_client"]
+
+        analysis = await analysis_service.analyze_entry(content)
         log.info("Analysis completed", entry_id=str(entry_id))
+        _, sentiment, keywords, *_ = analysis
 
-        # Update the database
-        analysis_service.update_journal_entry_with_analysis(
-            db,
-            entry_id,
-            title,
-            sentiment,
-            keywords,
-            summary,
-            emotional_landscape,
-            themes_topics,
-            cognitive_patterns,
-            relational_dynamics,
-            contextual_clues,
-        )
+        # Update the database without blocking the event loop
+        await asyncio.to_thread(save_analysis, analysis_service, entry_id, analysis)
         log.info("Database updated with analysis", entry_id=str(entry_id))
 
         # Generate the image prompt
-        image_prompt = asyncio.run(
-            prompt_generator.generate_prompt(sentiment, keywords, content)
+        image_prompt = await prompt_generator.generate_prompt(
+            sentiment, keywords, content
         )
 
         # Publish to the image generation queue
-        mq_client.publish(
+        await mq_client.publish(
             "image-gen-queue",
             {
                 "prompt": image_prompt,
@@ -124,12 +109,17 @@ def main():
     Main function to start the journal analysis consumer.
     """
     log.info("Starting journal analysis consumer...")
-    mq_client = RabbitMQClient()
+    mq_client = AsyncRabbitMQClient()
 
     try:
         queue_name = "journal-analysis-queue"
-        # Pass the dependency-injection function to the subscribe method
-        mq_client.subscribe(queue_name, callback, get_dependencies)
+        # Analysis mostly waits on Ollama, so many messages can be in flight
+        ConsumerRuntime(mq_client).add_consumer(
+            queue_name,
+            callback,
+            lambda: get_dependencies(mq_client),
+            concurrency=int(os.getenv("ANALYSIS_CONSUMER_CONCURRENCY", 8)),
+        ).run()
     except KeyboardInterrupt:
         log.info("Consumer stopped by user.")
     finally:
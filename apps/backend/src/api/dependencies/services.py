@@ -7,6 +7,8 @@ from src.ocr.service import TesseractOCRService
 from src.parsing.service import DocumentParserServiceImpl
 from src.text_processing.service import TextProcessingService
 from src.vector_store.clients.qdrant import QdrantVectorStoreClient
+from src.vector_store.clients.qdrant_async import AsyncQdrantVectorStoreClient
+from src.query.cache import RetrievalCache
 from src.query.service import QueryServiceImpl
 from src.journal.service import JournalService
 from src.db.database import get_db
@@ -22,6 +24,8 @@ ocr_service_singleton = TesseractOCRService()
 parser_service_singleton = DocumentParserServiceImpl()
 text_processing_singleton = TextProcessingService()
 vector_store_singleton = QdrantVectorStoreClient()
+async_vector_store_singleton = AsyncQdrantVectorStoreClient()
+retrieval_cache_singleton = RetrievalCache.from_env()
 
 
 def get_rabbitmq_client() -> RabbitMQClient:
@@ -36,6 +40,10 @@ def get_vector_store_client() -> QdrantVectorStoreClient:
     return vector_store_singleton
 
 
+def get_async_vector_store_client() -> AsyncQdrantVectorStoreClient:
+    return async_vector_store_singleton
+
+
 def get_file_storage_service() -> FileStorageService:
     # Initialize the service here instead, so it has access to env vars
     # loaded by the application.
@@ -86,6 +94,8 @@ def get_query_service():
     return QueryServiceImpl(
         embedding_service=text_processing_singleton,
         vector_store_client=vector_store_singleton,
+        async_vector_store_client=async_vector_store_singleton,
+        retrieval_cache=retrieval_cache_singleton,
     )
 
 
@@ -15,6 +15,10 @@ from src.api.routers import (
     ocr,
     images,
 )
+from src.api.dependencies.services import (
+    async_vector_store_singleton,
+    mq_client_singleton,
+)
 from src.api.metrics import REQUEST_COUNT, REQUEST_LATENCY
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 
@@ -29,6 +33,8 @@ async def lifespan(app: FastAPI):
     yield
     # On shutdown
     print("Application shutting down.")
+    await async_vector_store_singleton.close()
+    mq_client_singleton.close()
 
 
 app = FastAPI(title="MidJournal API", lifespan=lifespan)
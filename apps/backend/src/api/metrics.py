@@ -11,3 +11,46 @@ REQUEST_LATENCY = Histogram(
     "HTTP request latency in seconds",
     ["method", "endpoint"],
 )
+
+EMBEDDING_CACHE_HITS = Counter(
+    "embedding_cache_hits_total",
+    "Embedding lookups served from the cache",
+    ["tier"],
+)
+
+EMBEDDING_CACHE_MISSES = Counter(
+    "embedding_cache_misses_total",
+    "Embedding lookups that required a model call",
+)
+
+RETRIEVAL_CACHE_HITS = Counter(
+    "retrieval_cache_hits_total",
+    "Queries answered from the retrieval cache",
+)
+
+RETRIEVAL_CACHE_MISSES = Counter(
+    "retrieval_cache_misses_total",
+    "Queries that needed an embedding and a vector search",
+)
+
+CONTEXT_TOKENS_PACKED = Counter(
+    "chat_context_tokens_packed_total",
+    "Retrieved-context tokens included in chat prompts",
+)
+
+CONTEXT_TOKENS_DROPPED = Counter(
+    "chat_context_tokens_dropped_total",
+    "Retrieved-context tokens left out of chat prompts by the token budget",
+)
+
+CONTEXT_PROMPT_TOKENS = Histogram(
+    "chat_context_tokens",
+    "Retrieved-context tokens per chat prompt",
+    buckets=(64, 128, 256, 512, 1024, 2048, 4096, 8192),
+)
+
+CHAT_CONTEXT_MODE = Counter(
+    "chat_context_mode_total",
+    "Chat prompts by the kind of context they were built from",
+    ["mode"],
+)
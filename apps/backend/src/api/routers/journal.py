@@ -1,10 +1,11 @@
 from typing import List
 from uuid import UUID
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 
 from src.data_models.schemas import (
     JournalEntry,
     JournalEntryCreate,
+    JournalEntryUpdate,
     User,
 )
 from src.api.dependencies.auth import get_current_user
@@ -48,3 +49,18 @@ def get_journal_entry(
     journal_service: JournalService = Depends(get_journal_service),
 ):
     return journal_service.get_journal_entry(user_id=current_user.id, entry_id=entry_id)
+
+
+@router.put("/entries/{entry_id}", response_model=JournalEntry)
+def update_journal_entry(
+    entry_id: UUID,
+    entry: JournalEntryUpdate,
+    current_user: User = Depends(get_current_user),
+    journal_service: JournalService = Depends(get_journal_service),
+):
+    db_entry = journal_service.update_journal_entry(
+        user_id=current_user.id, entry_id=entry_id, entry_data=entry
+    )
+    if db_entry is None:
+        raise HTTPException(status_code=404, detail="Journal entry not found")
+    return db_entry
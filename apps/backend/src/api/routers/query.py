@@ -1,3 +1,5 @@
+from dataclasses import asdict
+
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 from typing import List, Dict, Any
@@ -9,6 +11,7 @@ from src.data_models.schemas import User
 from src.api.dependencies.auth import get_current_user
 from src.api.dependencies.services import get_query_service
 from src.llm.service import OllamaInferenceService
+from src.query.context import ChatContextBuilder
 from src.db.database import get_db
 from src.db import models as db_models
 
@@ -38,7 +41,13 @@ def perform_query(
     Accepts a user's query, retrieves relevant document chunks, and returns them.
     """
     results = query_service.query(user_id=str(current_user.id), query_text=request.text)
-    return {"results": results}
+    # Vectors are only used for selection and are not part of the response
+    return {
+        "results": [
+            {key: value for key, value in asdict(chunk).items() if key != "vector"}
+            for chunk in results
+        ]
+    }
 
 
 # This is a new, separate instance for the streaming endpoint.
@@ -56,11 +65,11 @@ async def perform_chat_query(
     """
     Accepts a user's query, retrieves context, and streams a response from an LLM.
     """
-    # 1. Get context
-    context_docs = query_service.query(
+    # 1. Get context, as raw chunks or as entry summaries if those don't fit
+    context_builder = ChatContextBuilder(query_service, db, llm_service.context_packer)
+    context_text = await context_builder.build(
         user_id=str(current_user.id), query_text=request.text
     )
-    context_text = [doc["text"] for doc in context_docs if "text" in doc]
 
     # 2. Generate and stream response
     response_stream = llm_service.generate_response_stream(
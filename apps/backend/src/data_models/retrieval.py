@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+@dataclass
+class RetrievedChunk:
+    """
+    One search hit. `payload` holds only the extra fields that were asked for,
+    and `vector` is only set when the hit's embedding was requested.
+    """
+
+    __slots__ = ("id", "score", "text", "payload", "vector")
+
+    id: str
+    score: float
+    text: str
+    payload: Dict[str, Any]
+    vector: Optional[np.ndarray]
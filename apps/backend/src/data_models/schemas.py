@@ -119,6 +119,11 @@ class JournalEntryCreate(JournalEntryBase):
     pass
 
 
+class JournalEntryUpdate(BaseModel):
+    title: Optional[str] = None
+    content: Optional[str] = None
+
+
 class JournalEntry(JournalEntryBase):
     id: uuid.UUID
     user_id: uuid.UUID
@@ -2,6 +2,7 @@ import uuid
 from datetime import datetime
 
 from sqlalchemy import (
+    BigInteger,
     Column,
     Integer,
     String,
@@ -65,6 +66,8 @@ class JournalEntry(Base):
     cognitive_patterns = Column(JSON, nullable=True)
     relational_dynamics = Column(JSON, nullable=True)
     contextual_clues = Column(JSON, nullable=True)
+    # Maps the content hash of each stored chunk to its vector store point id
+    chunk_manifest = Column(JSON, nullable=True)
 
     owner = relationship("User", back_populates="journal_entries")
 
@@ -83,3 +86,12 @@ class ChatHistory(Base):
     timestamp = Column(DateTime(timezone=True), default=datetime.utcnow)
 
     user = relationship("User", back_populates="chat_history")
+
+
+class VectorDataVersion(Base):
+    __tablename__ = "vector_data_versions"
+
+    # Bumped after every write or delete of the user's vectors, so caches of
+    # retrieval results in any process can tell when they are stale
+    user_id = Column(UUID(as_uuid=True), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -104,6 +104,9 @@ def main():
         queue_name=queue_name,
         callback=image_generation_callback,
         get_dependencies_func=get_dependencies,
+        # Each worker loads its own pipeline and generation is serialized by
+        # the model lock, so more workers would only cost memory.
+        prefetch_count=1,
     )
 
 
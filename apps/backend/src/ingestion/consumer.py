@@ -4,14 +4,17 @@ import uuid
 import json
 import logging
 import time
-from typing import Dict
+from itertools import chain
+from typing import Dict, List
 
 # Add the project root to the Python path to allow for absolute imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
 from src.message_queue.client import RabbitMQClient
+from src.text_processing.chunking import iter_text_segments
 from src.text_processing.service import TextProcessingService
 from src.vector_store.clients.qdrant import QdrantVectorStoreClient
+from src.vector_store.ids import point_id_for_chunk
 from src.db.database import SessionLocal
 
 # Configure logging
@@ -32,7 +35,7 @@ def get_dependencies() -> Dict:
     }
 
 
-def callback(ch, method, properties, body, deps=get_dependencies()):
+def callback(ch, method, properties, body, deps):
     """Callback function to process messages from the ingestion queue."""
     message = {}
     document_id = "N/A"
@@ -49,45 +52,168 @@ def callback(ch, method, properties, body, deps=get_dependencies()):
         text_processing_service: TextProcessingService = deps["text_processing_service"]
         vector_store_client: QdrantVectorStoreClient = deps["vector_store_client"]
 
+        # Chunks are embedded and saved window by window, so the first chunks
+        # become searchable before the rest of a large document is split.
+        # Point ids are content-addressed, so chunks already stored for this
+        # document (redeliveries, re-uploads) are skipped before embedding.
         logging.info(f"Starting text processing for document_id: {document_id}")
-        text_chunks, embeddings = text_processing_service.process_text(message["text"])
-        processing_time = time.time() - start_time
-        logging.info(
-            f"Text processing completed for document_id: {document_id} in {processing_time:.2f} seconds. Found {len(text_chunks)} chunks."
-        )
-
-        logging.info(f"Saving chunks to vector store for document_id: {document_id}")
-
-        # Prepare documents in the format expected by QdrantVectorStoreClient
-        documents_to_add = [
-            {"text": chunk, "vector": embedding, "source": "document"}
-            for chunk, embedding in zip(text_chunks, embeddings)
-        ]
+        user_uuid = uuid.UUID(user_id)
+        processing_time = 0.0
+        saving_time = 0.0
+        chunk_count = 0
+        skipped_count = 0
+        pending_upserts = []
+        window_start = time.time()
+        for window in text_processing_service.iter_chunk_windows(
+            iter_text_segments(message["text"])
+        ):
+            chunk_count += len(window)
+            new_chunks = {}
+            for chunk in window:
+                new_chunks.setdefault(
+                    point_id_for_chunk(user_uuid, document_id, chunk), chunk
+                )
+            existing_ids = vector_store_client.existing_point_ids(
+                user_id=user_uuid, point_ids=list(new_chunks)
+            )
+            for point_id in existing_ids:
+                del new_chunks[point_id]
+            skipped_count += len(window) - len(new_chunks)
+            if not new_chunks:
+                continue
+
+            texts = list(new_chunks.values())
+            embeddings = text_processing_service.embed_chunks(texts)
+            saving_start = time.time()
+            processing_time += saving_start - window_start
+            # Written behind, so the next window is embedded while this one uploads
+            pending_upserts += vector_store_client.add_embeddings(
+                user_id=user_uuid,
+                texts=texts,
+                embeddings=embeddings,
+                payload={"source": "document", "document_id": document_id},
+                ids=list(new_chunks),
+                wait=False,
+            )
+            window_start = time.time()
+            saving_time += window_start - saving_start
+
+        # Don't ack until every chunk is stored
+        saving_start = time.time()
+        vector_store_client.flush(pending_upserts)
+        saving_time += time.time() - saving_start
 
-        vector_store_client.add_documents(
-            user_id=uuid.UUID(user_id),
-            documents=documents_to_add,
+        logging.info(
+            f"Text processing completed for document_id: {document_id} in {processing_time:.2f} seconds. Found {chunk_count} chunks, {skipped_count} already stored."
         )
-        saving_time = time.time() - start_time - processing_time
         logging.info(
             f"Saved to vector store for document_id: {document_id} in {saving_time:.2f} seconds."
         )
 
-        ch.basic_ack(delivery_tag=method.delivery_tag)
         total_time = time.time() - start_time
         logging.info(
-            f"Successfully processed and ACKed document_id: {document_id}. Total time: {total_time:.2f} seconds."
+            f"Successfully processed document_id: {document_id}. Total time: {total_time:.2f} seconds."
         )
 
+    # The client acks on return and nacks (dead-letters) when the callback raises
     except json.JSONDecodeError as e:
         logging.error(f"Failed to decode JSON body: {body}. Error: {e}", exc_info=True)
-        ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+        raise
     except Exception as e:
         logging.error(
             f"Failed to process message for document_id: {document_id}. Error: {e}",
             exc_info=True,
         )
-        ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+        raise
+
+
+def batch_callback(bodies: List[bytes], deps) -> List[bool]:
+    """
+    Processes a batch of ingestion messages together: every document is
+    chunked on its own, then all new chunks are embedded in one pass and
+    upserted in one bulk write. Returns whether each message succeeded; a
+    document that fails to parse or split fails alone. If the bulk embedding
+    or write fails, the documents are retried one by one through `callback`.
+    """
+    start_time = time.time()
+    text_processing_service: TextProcessingService = deps["text_processing_service"]
+    vector_store_client: QdrantVectorStoreClient = deps["vector_store_client"]
+
+    outcomes = [False] * len(bodies)
+    documents = []  # (message index, user id, document id, {point id: chunk})
+    for i, body in enumerate(bodies):
+        document_id = "N/A"
+        try:
+            message = json.loads(body)
+            document_id = message.get("document_id", "N/A")
+            user_uuid = uuid.UUID(message.get("user_id", "N/A"))
+            chunks = {}
+            # Chunked exactly like single mode, so both give the same point ids
+            for chunk in chain.from_iterable(
+                text_processing_service.iter_chunk_windows(
+                    iter_text_segments(message["text"])
+                )
+            ):
+                chunks.setdefault(
+                    point_id_for_chunk(user_uuid, document_id, chunk), chunk
+                )
+            documents.append((i, user_uuid, document_id, chunks))
+        except Exception as e:
+            logging.error(
+                f"Failed to process message for document_id: {document_id}. Error: {e}",
+                exc_info=True,
+            )
+
+    try:
+        # One existence check per user, so redelivered chunks are skipped
+        point_ids_by_user: Dict[uuid.UUID, List[str]] = {}
+        for _, user_uuid, _, chunks in documents:
+            point_ids_by_user.setdefault(user_uuid, []).extend(chunks)
+        existing_ids = set()
+        for user_uuid, point_ids in point_ids_by_user.items():
+            existing_ids |= vector_store_client.existing_point_ids(
+                user_id=user_uuid, point_ids=point_ids
+            )
+
+        user_ids, texts, payloads, ids = [], [], [], []
+        for _, user_uuid, document_id, chunks in documents:
+            for point_id, chunk in chunks.items():
+                if point_id in existing_ids:
+                    continue
+                existing_ids.add(point_id)
+                user_ids.append(user_uuid)
+                texts.append(chunk)
+                payloads.append({"source": "document", "document_id": document_id})
+                ids.append(point_id)
+
+        if texts:
+            embeddings = text_processing_service.embed_chunks(texts)
+            vector_store_client.add_embeddings_bulk(
+                user_ids=user_ids,
+                texts=texts,
+                embeddings=embeddings,
+                payloads=payloads,
+                ids=ids,
+            )
+    except Exception as e:
+        logging.error(
+            f"Failed to store batch of {len(documents)} documents, retrying them one by one. Error: {e}",
+            exc_info=True,
+        )
+        for i, *_ in documents:
+            try:
+                callback(None, None, None, bodies[i], deps)
+                outcomes[i] = True
+            except Exception:
+                pass  # Logged by callback
+        return outcomes
+
+    for i, *_ in documents:
+        outcomes[i] = True
+    logging.info(
+        f"Processed batch of {len(bodies)} messages ({len(documents)} documents, {len(texts)} new chunks) in {time.time() - start_time:.2f} seconds."
+    )
+    return outcomes
 
 
 def main():
@@ -100,7 +226,18 @@ def main():
 
     try:
         queue_name = "ingestion-queue"
-        mq_client.subscribe(queue_name, callback, get_dependencies)
+        # "single" processes one document per message; "batch" groups messages
+        # so many small documents share an embedding pass and a write.
+        if os.getenv("INGESTION_CONSUMER_MODE", "single") == "batch":
+            mq_client.subscribe_batch(
+                queue_name,
+                batch_callback,
+                get_dependencies,
+                batch_size=int(os.getenv("INGESTION_BATCH_SIZE", 32)),
+                max_wait_ms=int(os.getenv("INGESTION_BATCH_MAX_WAIT_MS", 200)),
+            )
+        else:
+            mq_client.subscribe(queue_name, callback, get_dependencies)
     except KeyboardInterrupt:
         print("Consumer stopped by user.")
     finally:
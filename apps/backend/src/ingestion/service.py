@@ -4,6 +4,7 @@ from src.interfaces.document_ingestion_service import DocumentIngestionService
 from src.interfaces.message_queue_client import MessageQueueClient
 from src.interfaces.ocr_service import OCRService
 from src.interfaces.document_parser_service import DocumentParserService
+from src.vector_store.ids import document_id_for_text
 
 
 class DocumentIngestionServiceImpl(DocumentIngestionService):
@@ -46,7 +47,8 @@ class DocumentIngestionServiceImpl(DocumentIngestionService):
         )
 
     async def process_and_queue_text(self, user_id: str, text: str) -> str:
-        document_id = str(uuid.uuid4())
+        # Content-derived, so a re-uploaded file maps onto its existing chunks
+        document_id = document_id_for_text(user_id, text)
         message = {
             "user_id": user_id,
             "document_id": document_id,
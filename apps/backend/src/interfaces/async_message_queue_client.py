@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Dict, Optional
+
+
+class AsyncMessageQueueClient(ABC):
+    @abstractmethod
+    async def publish(self, queue_name: str, message: Dict):
+        """
+        Publishes a message to the specified queue and waits for the broker
+        to confirm it.
+        """
+        pass
+
+    @abstractmethod
+    async def subscribe(
+        self,
+        queue_name: str,
+        callback: Callable[[bytes], Awaitable[None]],
+        concurrency: Optional[int] = None,
+    ):
+        """
+        Starts consuming a queue on the running event loop, handling up to
+        `concurrency` messages at once. A message is acked when the callback
+        returns and dead-lettered when it raises.
+        """
+        pass
+
+    @abstractmethod
+    async def close(self):
+        """
+        Closes the connection to the message queue.
+        """
+        pass
@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence, Union
+import uuid
+
+import numpy as np
+
+from src.data_models.retrieval import RetrievedChunk
+
+
+class AsyncVectorStoreClient(ABC):
+    """
+    Read-side vector store client for async request handlers, so a slow search
+    does not block the event loop.
+    """
+
+    @abstractmethod
+    async def query(
+        self,
+        user_id: uuid.UUID,
+        query_embedding: Union[List[float], np.ndarray],
+        top_k: int = 5,
+        query_text: Optional[str] = None,
+        payload_fields: Optional[Sequence[str]] = None,
+        with_vectors: bool = False,
+    ) -> List[RetrievedChunk]:
+        """
+        Queries the vector store for a user to find the most relevant documents.
+        When the query text is given, it may also be matched lexically. Hits
+        carry their text plus only the requested `payload_fields`, and their
+        vectors if `with_vectors` is set.
+        """
+        pass
+
+    @abstractmethod
+    async def close(self):
+        """
+        Closes the client's pooled connections.
+        """
+        pass
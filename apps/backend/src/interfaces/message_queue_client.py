@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Callable, Dict
+from typing import Callable, Dict, Iterable, Optional
 
 
 class MessageQueueClient(ABC):
@@ -10,6 +10,22 @@ class MessageQueueClient(ABC):
         """
         pass
 
+    @abstractmethod
+    def publish_many(self, queue_name: str, messages: Iterable[Dict]):
+        """
+        Publishes many messages to the specified queue without waiting for each
+        to be confirmed.
+        """
+        pass
+
+    @abstractmethod
+    def flush(self, timeout: Optional[float] = None):
+        """
+        Waits until messages sent with publish_many are confirmed, raising if
+        any could not be delivered.
+        """
+        pass
+
     @abstractmethod
     def subscribe(self, queue_name: str, callback_function: Callable):
         """
@@ -17,6 +33,21 @@ class MessageQueueClient(ABC):
         """
         pass
 
+    @abstractmethod
+    def subscribe_batch(
+        self,
+        queue_name: str,
+        batch_callback: Callable,
+        get_dependencies_func: Optional[Callable] = None,
+        batch_size: int = 32,
+        max_wait_ms: int = 200,
+    ):
+        """
+        Subscribes to a queue and processes messages in batches, acking or
+        rejecting each message according to the callback's result for it.
+        """
+        pass
+
     @abstractmethod
     def close(self):
         """
@@ -1,18 +1,41 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Optional
+
+from src.data_models.retrieval import RetrievedChunk
 
 
 class QueryService(ABC):
     @abstractmethod
-    def query(self, user_id: str, query_text: str) -> List[Dict[str, Any]]:
+    def query(
+        self, user_id: str, query_text: str, top_k: Optional[int] = None
+    ) -> List[RetrievedChunk]:
         """
         Processes a user's query, retrieves relevant document chunks, and returns them.
 
         Args:
             user_id: The ID of the user performing the query.
             query_text: The user's query text.
+            top_k: How many chunks to return, if not the service's default.
 
         Returns:
-            A list of relevant document chunks, as dictionaries.
+            A list of relevant document chunks, with their scores and ids.
+        """
+        pass
+
+    @abstractmethod
+    async def aquery(
+        self, user_id: str, query_text: str, top_k: Optional[int] = None
+    ) -> List[RetrievedChunk]:
+        """
+        Async version of `query`, which must not block the event loop.
+        """
+        pass
+
+    @abstractmethod
+    def query_many(
+        self, user_id: str, query_texts: List[str]
+    ) -> List[List[RetrievedChunk]]:
+        """
+        Runs several queries for one user, returning each query's chunks in order.
         """
         pass
@@ -1,7 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from concurrent.futures import Future
+from typing import List, Dict, Any, Optional, Sequence, Set, Union
 import uuid
 
+import numpy as np
+
+from src.data_models.retrieval import RetrievedChunk
+
 
 class VectorStoreClient(ABC):
     @abstractmethod
@@ -12,11 +17,111 @@ class VectorStoreClient(ABC):
         """
         pass
 
+    @abstractmethod
+    def add_embeddings(
+        self,
+        user_id: uuid.UUID,
+        texts: List[str],
+        embeddings: np.ndarray,
+        payload: Optional[Dict[str, Any]] = None,
+        ids: Optional[List[str]] = None,
+        wait: bool = True,
+    ) -> List[Future]:
+        """
+        Adds chunks to the vector store for a specific user, with their embeddings
+        given as one (len(texts), dim) float32 array. `payload` holds extra fields
+        shared by every chunk, such as the source. Unless given in `ids`, point
+        ids are derived from the user, the source id in the payload and each
+        chunk's content, so repeated adds of the same chunk are idempotent.
+
+        With `wait=False` the write happens in the background and the returned
+        futures can be passed to `flush`.
+        """
+        pass
+
+    @abstractmethod
+    def add_embeddings_bulk(
+        self,
+        user_ids: List[uuid.UUID],
+        texts: List[str],
+        embeddings: np.ndarray,
+        payloads: List[Dict[str, Any]],
+        ids: List[str],
+        wait: bool = True,
+    ) -> List[Future]:
+        """
+        Adds chunks of several users and sources in one write. Row i belongs to
+        `user_ids[i]` and carries `payloads[i]`.
+        """
+        pass
+
+    @abstractmethod
+    def flush(self, futures: Optional[List[Future]] = None):
+        """
+        Blocks until the given background writes, or all pending ones, are applied.
+        """
+        pass
+
+    @abstractmethod
+    def data_version(self, user_id: uuid.UUID) -> int:
+        """
+        Returns a counter that changes whenever the user's stored vectors change,
+        for invalidating anything derived from them.
+        """
+        pass
+
+    @abstractmethod
+    def existing_point_ids(self, user_id: uuid.UUID, point_ids: List[str]) -> Set[str]:
+        """
+        Returns the subset of `point_ids` already stored for the user.
+        """
+        pass
+
+    @abstractmethod
+    def delete_points(self, user_id: uuid.UUID, point_ids: List[str]):
+        """
+        Deletes the given points, restricted to those owned by the user.
+        """
+        pass
+
+    @abstractmethod
+    def delete_legacy_chunks(self, user_id: uuid.UUID, texts: List[str]):
+        """
+        Deletes the user's points stored without a journal_entry_id whose text
+        is one of `texts`.
+        """
+        pass
+
     @abstractmethod
     def query(
-        self, user_id: uuid.UUID, query_embedding: List[float], top_k: int = 5
-    ) -> List[Dict[str, Any]]:
+        self,
+        user_id: uuid.UUID,
+        query_embedding: Union[List[float], np.ndarray],
+        top_k: int = 5,
+        query_text: Optional[str] = None,
+        payload_fields: Optional[Sequence[str]] = None,
+        with_vectors: bool = False,
+    ) -> List[RetrievedChunk]:
         """
         Queries the vector store for a user to find the most relevant documents.
+        When the query text is given, it may also be matched lexically. Hits
+        carry their text plus only the requested `payload_fields`, and their
+        vectors if `with_vectors` is set.
+        """
+        pass
+
+    @abstractmethod
+    def query_batch(
+        self,
+        user_id: uuid.UUID,
+        embeddings: np.ndarray,
+        top_k: int = 5,
+        query_texts: Optional[List[str]] = None,
+        payload_fields: Optional[Sequence[str]] = None,
+        with_vectors: bool = False,
+    ) -> List[List[RetrievedChunk]]:
+        """
+        Runs one query per row of a (n, dim) embedding array in a single round
+        trip, returning each query's documents in order.
         """
         pass
@@ -1,12 +1,15 @@
+from typing import Optional
 from uuid import UUID
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
-from src.data_models.schemas import JournalEntryCreate
+from src.data_models.schemas import JournalEntryCreate, JournalEntryUpdate
 from src.db.models import JournalEntry as JournalEntryModel
 from src.interfaces.message_queue_client import MessageQueueClient
+from src.text_processing.chunking import chunk_hash
 from src.text_processing.service import TextProcessingService
 from src.interfaces.vector_store_client import VectorStoreClient
+from src.vector_store.ids import point_id_for_chunk
 
 
 class JournalService:
@@ -36,37 +39,128 @@ class JournalService:
 
         # Step 2: Create and save the journal entry
         db_entry = JournalEntryModel(
-            **entry_data.model_dump(), user_id=user_id, entry_number=next_entry_number
+            **entry_data.model_dump(),
+            user_id=user_id,
+            entry_number=next_entry_number,
+            chunk_manifest={},
         )
         self.db_session.add(db_entry)
         self.db_session.commit()
         self.db_session.refresh(db_entry)
 
         # Process text for vector store
-        text_chunks, embeddings = self.text_processing_service.process_text(
-            db_entry.content
+        self._sync_entry_chunks(user_id, db_entry)
+
+        # Queue for qualitative analysis
+        self._queue_analysis(user_id, db_entry)
+
+        return db_entry
+
+    def update_journal_entry(
+        self, user_id: UUID, entry_id: UUID, entry_data: JournalEntryUpdate
+    ) -> Optional[JournalEntryModel]:
+        db_entry = self.get_journal_entry(user_id=user_id, entry_id=entry_id)
+        if db_entry is None:
+            return None
+
+        updates = entry_data.model_dump(exclude_unset=True, exclude_none=True)
+        previous_content = db_entry.content
+        content_changed = (
+            "content" in updates and updates["content"] != previous_content
         )
-        documents_to_add = [
-            {"text": chunk, "vector": embedding, "source": "journal"}
-            for chunk, embedding in zip(text_chunks, embeddings)
+        for field, value in updates.items():
+            setattr(db_entry, field, value)
+        self.db_session.commit()
+
+        if content_changed:
+            self._sync_entry_chunks(user_id, db_entry, previous_content)
+            self._queue_analysis(user_id, db_entry)
+
+        self.db_session.refresh(db_entry)
+        return db_entry
+
+    def _sync_entry_chunks(
+        self,
+        user_id: UUID,
+        db_entry: JournalEntryModel,
+        previous_content: Optional[str] = None,
+    ):
+        """
+        Brings the entry's vectors in line with its content. The entry's chunk
+        manifest maps chunk content hashes to point ids, so only chunks with an
+        unseen hash are embedded, and only points of chunks that disappeared
+        are deleted. `previous_content` is what the stored vectors were built
+        from, needed for entries indexed before manifests existed.
+        """
+        manifest = db_entry.chunk_manifest
+        legacy_chunks = []
+        if manifest is None:
+            manifest = {}
+            # Indexed before manifests existed: its points have random ids and
+            # no journal_entry_id, so they can only be found by their text.
+            legacy_chunks = self.text_processing_service.split_text(
+                previous_content or db_entry.content
+            )
+
+        current_chunks = {}
+        for chunk in self.text_processing_service.split_text(db_entry.content):
+            current_chunks.setdefault(chunk_hash(chunk), chunk)
+
+        new_hashes = [h for h in current_chunks if h not in manifest]
+        new_point_ids = {
+            h: point_id_for_chunk(user_id, db_entry.id, current_chunks[h])
+            for h in new_hashes
+        }
+        if new_hashes:
+            new_chunks = [current_chunks[h] for h in new_hashes]
+            self.vector_store_client.add_embeddings(
+                user_id=user_id,
+                texts=new_chunks,
+                embeddings=self.text_processing_service.embed_chunks(new_chunks),
+                payload={"source": "journal", "journal_entry_id": str(db_entry.id)},
+                ids=[new_point_ids[h] for h in new_hashes],
+            )
+
+        # Deleted after the upsert so the entry is never missing from search
+        stale_point_ids = [
+            point_id for h, point_id in manifest.items() if h not in current_chunks
         ]
-        self.vector_store_client.add_documents(
-            user_id=user_id, documents=documents_to_add
+        self.vector_store_client.delete_points(
+            user_id=user_id, point_ids=stale_point_ids
+        )
+        self.vector_store_client.delete_legacy_chunks(
+            user_id=user_id, texts=legacy_chunks
         )
 
-        # Queue for qualitative analysis
+        db_entry.chunk_manifest = {
+            h: manifest.get(h) or new_point_ids[h] for h in current_chunks
+        }
+        self.db_session.commit()
+        print(
+            f"Indexed entry {db_entry.id}: {len(new_hashes)} chunks embedded, "
+            f"{len(stale_point_ids)} removed, {len(current_chunks) - len(new_hashes)} unchanged"
+        )
+
+    def _queue_analysis(self, user_id: UUID, db_entry: JournalEntryModel):
         message = {
             "journal_entry_id": str(db_entry.id),
             "user_id": str(user_id),
             "content": db_entry.content,
         }
-        self.mq_client.publish(queue_name=self.analysis_queue_name, message=message)
+        try:
+            self.mq_client.publish(queue_name=self.analysis_queue_name, message=message)
+        except Exception as e:
+            # The entry is already saved and indexed; failing the request now
+            # would only make clients retry and create duplicates.
+            print(
+                f"Failed to queue analysis for entry {db_entry.id}, "
+                f"it stays unanalysed: {e}"
+            )
+            return
         print(
             f" [x] Sent message to queue '{self.analysis_queue_name}' for entry {db_entry.id}"
         )
 
-        return db_entry
-
     def get_journal_entries(
         self, user_id: UUID, limit: int, offset: int
     ) -> list[JournalEntryModel]:
@@ -81,7 +175,7 @@ class JournalService:
 
     def get_journal_entry(
         self, user_id: UUID, entry_id: UUID
-    ) -> JournalEntryModel | None:
+    ) -> Optional[JournalEntryModel]:
         return (
             self.db_session.query(JournalEntryModel)
             .filter(
@@ -0,0 +1,101 @@
+import logging
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, List
+
+from src.api.metrics import (
+    CONTEXT_PROMPT_TOKENS,
+    CONTEXT_TOKENS_DROPPED,
+    CONTEXT_TOKENS_PACKED,
+)
+from src.text_processing.embedding import MODEL_NAME
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+
+@lru_cache(maxsize=None)
+def get_token_counter(tokenizer_name: str) -> Callable[[str], int]:
+    """
+    Returns a token counter for the named Hugging Face tokenizer, loaded once
+    per process. The chat model's own tokenizer is not available outside
+    Ollama, so another tokenizer stands in for it. If it cannot be loaded,
+    tokens are estimated at four characters each.
+    """
+    try:
+        from transformers import AutoTokenizer
+
+        tokenizer = AutoTokenizer.from_pretrained(tokenizer_name)
+    except Exception as e:
+        logging.warning(
+            f"Could not load tokenizer '{tokenizer_name}', estimating tokens: {e}"
+        )
+        return lambda text: (len(text) + 3) // 4
+
+    return lambda text: len(
+        tokenizer.encode(text, add_special_tokens=False, verbose=False)
+    )
+
+
+@dataclass
+class PackedContext:
+    texts: List[str]
+    packed_tokens: int
+    dropped_tokens: int
+
+
+class ContextPacker:
+    """
+    Fills a token budget with retrieved chunks in relevance order.
+
+    Chunks are taken whole while they fit. The first chunk that does not fit
+    is cut at the last sentence boundary within the remaining budget, and
+    everything after it is dropped.
+    """
+
+    def __init__(self, token_budget: int, tokenizer_name: str):
+        self.token_budget = token_budget
+        self.tokenizer_name = tokenizer_name
+
+    @classmethod
+    def from_env(cls) -> "ContextPacker":
+        return cls(
+            token_budget=int(os.getenv("CHAT_CONTEXT_TOKEN_BUDGET", 2048)),
+            tokenizer_name=os.getenv("CHAT_CONTEXT_TOKENIZER", MODEL_NAME),
+        )
+
+    def count_tokens(self, texts: List[str]) -> int:
+        count = get_token_counter(self.tokenizer_name)
+        return sum(count(text) for text in texts)
+
+    def pack(self, chunks: List[str]) -> PackedContext:
+        count_tokens = get_token_counter(self.tokenizer_name)
+        texts: List[str] = []
+        packed = dropped = 0
+        for i, chunk in enumerate(chunks):
+            remaining = self.token_budget - packed
+            tokens = count_tokens(chunk)
+            if tokens <= remaining:
+                texts.append(chunk)
+                packed += tokens
+                continue
+
+            kept, kept_tokens = [], 0
+            for sentence in SENTENCE_BOUNDARY.split(chunk):
+                sentence_tokens = count_tokens(sentence)
+                if kept_tokens + sentence_tokens > remaining:
+                    break
+                kept.append(sentence)
+                kept_tokens += sentence_tokens
+            if kept:
+                texts.append(" ".join(kept))
+                packed += kept_tokens
+            dropped += tokens - kept_tokens
+            dropped += sum(count_tokens(rest) for rest in chunks[i + 1 :])
+            break
+
+        CONTEXT_TOKENS_PACKED.inc(packed)
+        CONTEXT_TOKENS_DROPPED.inc(dropped)
+        CONTEXT_PROMPT_TOKENS.observe(packed)
+        return PackedContext(texts=texts, packed_tokens=packed, dropped_tokens=dropped)
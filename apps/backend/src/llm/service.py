@@ -3,6 +3,7 @@ from typing import List, Dict, Any, AsyncGenerator
 import ollama
 
 from src.interfaces.llm_inference_service import LLMInferenceService
+from src.llm.context import ContextPacker
 from src.llm.prompts import SYSTEM_PROMPT
 
 
@@ -10,14 +11,17 @@ class OllamaInferenceService(LLMInferenceService):
     def __init__(self):
         self.ollama_host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
         self.model = os.getenv("OLLAMA_MODEL", "gemma3n:e4b")
+        self.context_packer = ContextPacker.from_env()
 
     async def generate_response_stream(
         self, query: str, context: List[str], user_id: str, model_config: Dict[str, Any]
     ) -> AsyncGenerator[str, None]:
         """
-        Generates and streams a response from Ollama using the provided context.
+        Generates and streams a response from Ollama using the provided context,
+        packed into the context token budget in the order given.
         """
-        context_str = "\n".join(context)
+        packed = self.context_packer.pack(context)
+        context_str = "\n".join(packed.texts)
 
         prompt = SYSTEM_PROMPT.format(context_str=context_str, query=query)
 
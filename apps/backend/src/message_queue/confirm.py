@@ -0,0 +1,218 @@
+import collections
+import json
+import logging
+import threading
+import time
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+import pika
+
+# (queue name, JSON body, number of times already nacked)
+_Message = Tuple[str, str, int]
+
+
+class UndeliveredMessagesError(Exception):
+    """Raised by `flush()` when messages were nacked more times than allowed."""
+
+    def __init__(self, messages: List[Tuple[str, dict]]):
+        self.messages = messages
+        super().__init__(f"{len(messages)} message(s) could not be delivered")
+
+
+class ConfirmPublisher:
+    """
+    Publishes with RabbitMQ publisher confirms without waiting on each message.
+
+    Runs its own connection on a background I/O thread. Up to `max_in_flight`
+    messages are queued or awaiting a confirm at any time, and publishing
+    blocks beyond that. Broker acks release messages, often many delivery tags
+    at once. Nacked messages are published again up to `max_retries` times.
+    Messages still unconfirmed when the connection drops are republished after
+    reconnecting, so delivery is at-least-once. `flush()` waits until
+    everything published so far is settled.
+    """
+
+    def __init__(
+        self,
+        rabbitmq_url: str,
+        max_in_flight: int = 1000,
+        max_retries: int = 3,
+        reconnect_delay: float = 2.0,
+    ):
+        self.rabbitmq_url = rabbitmq_url
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.reconnect_delay = reconnect_delay
+
+        # Shared with the I/O thread; guarded by the condition
+        self._cond = threading.Condition()
+        self._pending: Deque[_Message] = collections.deque()
+        self._in_flight: Dict[int, _Message] = {}
+        self._failed: List[Tuple[str, dict]] = []
+
+        # Owned by the I/O thread
+        self._connection: Optional[pika.SelectConnection] = None
+        self._channel = None
+        self._delivery_tag = 0
+
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stopping = False
+
+    def _outstanding(self) -> int:
+        return len(self._pending) + len(self._in_flight)
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(
+                    target=self._run, name="rabbitmq-confirm-publisher", daemon=True
+                )
+                self._thread.start()
+
+    def _wake(self):
+        """Asks the I/O thread to send whatever is pending."""
+        connection = self._connection
+        if connection is not None and connection.is_open:
+            connection.ioloop.add_callback_threadsafe(self._send_pending)
+
+    def publish_many(self, queue_name: str, messages: Iterable[dict]):
+        """Queues messages for publishing; blocks while too many are in flight."""
+        self._ensure_started()
+        bodies = [json.dumps(message) for message in messages]
+        with self._cond:
+            for body in bodies:
+                if self._outstanding() >= self.max_in_flight:
+                    self._wake()
+                    self._cond.wait_for(
+                        lambda: self._outstanding() < self.max_in_flight
+                    )
+                self._pending.append((queue_name, body, 0))
+        self._wake()
+
+    def flush(self, timeout: Optional[float] = None):
+        """
+        Waits until every message published so far is confirmed. Raises
+        `UndeliveredMessagesError` for messages that ran out of retries, and
+        `TimeoutError` if messages are still unconfirmed after `timeout`.
+        """
+        self._wake()
+        with self._cond:
+            settled = self._cond.wait_for(
+                lambda: self._outstanding() == 0, timeout=timeout
+            )
+            outstanding = self._outstanding()
+            failed, self._failed = self._failed, []
+        if failed:
+            raise UndeliveredMessagesError(failed)
+        if not settled:
+            raise TimeoutError(f"{outstanding} message(s) still unconfirmed")
+
+    def close(self):
+        """Stops the I/O thread. Call `flush()` first to wait for confirms."""
+        with self._start_lock:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+        if thread is None:
+            return
+        connection = self._connection
+        if connection is not None and connection.is_open:
+            connection.ioloop.add_callback_threadsafe(connection.close)
+        thread.join()
+
+    # I/O thread
+
+    def _run(self):
+        while not self._stopping:
+            self._connection = pika.SelectConnection(
+                pika.URLParameters(self.rabbitmq_url),
+                on_open_callback=self._on_connection_open,
+                on_open_error_callback=self._on_connection_error,
+                on_close_callback=self._on_connection_closed,
+            )
+            self._connection.ioloop.start()
+            if not self._stopping:
+                time.sleep(self.reconnect_delay)
+
+    def _on_connection_open(self, connection):
+        connection.channel(on_open_callback=self._on_channel_open)
+
+    def _on_connection_error(self, connection, error):
+        logging.warning(f"Confirm publisher could not connect to RabbitMQ: {error}")
+        connection.ioloop.stop()
+
+    def _on_connection_closed(self, connection, reason):
+        self._channel = None
+        self._requeue_in_flight()
+        if not self._stopping:
+            logging.warning(f"Confirm publisher lost its RabbitMQ connection: {reason}")
+        connection.ioloop.stop()
+
+    def _on_channel_open(self, channel):
+        channel.add_on_close_callback(self._on_channel_closed)
+        self._delivery_tag = 0
+        channel.confirm_delivery(
+            ack_nack_callback=self._on_confirm,
+            callback=lambda _: self._on_confirm_select_ok(channel),
+        )
+
+    def _on_confirm_select_ok(self, channel):
+        self._channel = channel
+        self._send_pending()
+
+    def _on_channel_closed(self, channel, reason):
+        self._channel = None
+        self._requeue_in_flight()
+        # Reconnect from scratch rather than reopen a channel on a broken connection
+        if self._connection is not None and self._connection.is_open:
+            self._connection.close()
+
+    def _requeue_in_flight(self):
+        with self._cond:
+            self._pending.extendleft(reversed(list(self._in_flight.values())))
+            self._in_flight.clear()
+
+    def _send_pending(self):
+        channel = self._channel
+        if channel is None or not channel.is_open:
+            return
+        with self._cond:
+            batch = list(self._pending)
+            self._pending.clear()
+            for message in batch:
+                self._delivery_tag += 1
+                self._in_flight[self._delivery_tag] = message
+        for queue_name, body, _ in batch:
+            channel.basic_publish(
+                exchange="",
+                routing_key=queue_name,
+                body=body,
+                properties=pika.BasicProperties(
+                    delivery_mode=2,  # make message persistent
+                ),
+            )
+
+    def _on_confirm(self, frame):
+        method = frame.method
+        nacked = isinstance(method, pika.spec.Basic.Nack)
+        with self._cond:
+            if method.multiple:
+                tags = [tag for tag in self._in_flight if tag <= method.delivery_tag]
+            else:
+                tags = [method.delivery_tag]
+            for tag in tags:
+                message = self._in_flight.pop(tag, None)
+                if message is None or not nacked:
+                    continue
+                queue_name, body, attempts = message
+                if attempts < self.max_retries:
+                    self._pending.append((queue_name, body, attempts + 1))
+                else:
+                    logging.error(
+                        f"Message to '{queue_name}' nacked {attempts + 1} times, giving up"
+                    )
+                    self._failed.append((queue_name, json.loads(body)))
+            self._cond.notify_all()
+        if nacked:
+            self._send_pending()
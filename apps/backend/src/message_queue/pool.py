@@ -0,0 +1,95 @@
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
+import pika
+from pika.adapters.blocking_connection import BlockingChannel
+
+
+class ChannelPool:
+    """
+    Thread-safe pool of long-lived publishing channels.
+
+    A pika connection must not be used from several threads, so each pooled
+    channel has its own connection and is held by one thread at a time.
+    Connections are opened lazily up to `size`; callers beyond that wait for
+    a channel to be returned. A channel whose connection fails while in use is
+    discarded, and the next checkout opens a fresh one.
+    """
+
+    def __init__(self, url: str, size: int = 4):
+        self.url = url
+        self.size = size
+        # Most recently used first, so idle connections are the ones left to expire
+        self._idle: "queue.LifoQueue[Tuple[pika.BlockingConnection, BlockingChannel]]" = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _open(self) -> Tuple[pika.BlockingConnection, BlockingChannel]:
+        connection = pika.BlockingConnection(pika.URLParameters(self.url))
+        return connection, connection.channel()
+
+    def _checkout(self, fresh: bool) -> Tuple[pika.BlockingConnection, BlockingChannel]:
+        if not fresh:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+        with self._lock:
+            # A fresh connection is opened even when the pool is at its size
+            can_open = fresh or self._opened < self.size
+            if can_open:
+                self._opened += 1
+        if not can_open:
+            return self._idle.get()
+        try:
+            return self._open()
+        except Exception:
+            with self._lock:
+                self._opened -= 1
+            raise
+
+    def _discard(self, connection: pika.BlockingConnection):
+        with self._lock:
+            self._opened -= 1
+        try:
+            if connection.is_open:
+                connection.close()
+        except Exception as e:
+            logging.debug(f"Error closing discarded RabbitMQ connection: {e}")
+
+    @contextmanager
+    def channel(self, fresh: bool = False) -> Iterator[BlockingChannel]:
+        """
+        Checks out a channel for the duration of the block. With `fresh`, a
+        newly opened connection is used instead of an idle one.
+        """
+        connection, channel = self._checkout(fresh)
+        try:
+            if not (connection.is_open and channel.is_open):
+                raise pika.exceptions.AMQPConnectionError("Pooled connection closed")
+            # Services heartbeats missed while idle and surfaces a dead socket
+            connection.process_data_events(time_limit=0)
+            yield channel
+        except BaseException:
+            self._discard(connection)
+            raise
+        else:
+            self._idle.put((connection, channel))
+
+    def discard_idle(self):
+        """
+        Closes every idle connection. Idle connections miss their heartbeats
+        together, so when one turns out dead the others usually are too.
+        """
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(connection)
+
+    def close(self):
+        self.discard_idle()
@@ -0,0 +1,61 @@
+import asyncio
+import signal
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.interfaces.async_message_queue_client import AsyncMessageQueueClient
+
+AsyncCallback = Callable[[bytes, Dict], Awaitable[None]]
+
+
+class ConsumerRuntime:
+    """
+    Hosts async consumers for one or more queues on a single long-lived event
+    loop per process. Each queue gets its dependencies once, shared by all of
+    its concurrently running messages, so anything per-message (such as a DB
+    session) should be opened inside the callback.
+    """
+
+    def __init__(self, client: AsyncMessageQueueClient):
+        self.client = client
+        self._consumers: List[
+            Tuple[str, AsyncCallback, Optional[Callable[[], Dict]], Optional[int]]
+        ] = []
+
+    def add_consumer(
+        self,
+        queue_name: str,
+        callback: AsyncCallback,
+        get_dependencies_func: Optional[Callable[[], Dict]] = None,
+        concurrency: Optional[int] = None,
+    ) -> "ConsumerRuntime":
+        self._consumers.append(
+            (queue_name, callback, get_dependencies_func, concurrency)
+        )
+        return self
+
+    async def serve(self):
+        """Consumes every registered queue until SIGINT or SIGTERM."""
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except NotImplementedError:
+                pass
+
+        try:
+            for queue_name, callback, get_deps, concurrency in self._consumers:
+                deps = get_deps() if get_deps else {}
+                await self.client.subscribe(
+                    queue_name,
+                    lambda body, callback=callback, deps=deps: callback(body, deps),
+                    concurrency,
+                )
+            await stop.wait()
+            print("Consumer runtime stopping.")
+        finally:
+            # Messages still being processed are not acked and will be redelivered
+            await self.client.close()
+
+    def run(self):
+        asyncio.run(self.serve())
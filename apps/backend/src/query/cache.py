@@ -0,0 +1,77 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from src.api.metrics import RETRIEVAL_CACHE_HITS, RETRIEVAL_CACHE_MISSES
+from src.data_models.retrieval import RetrievedChunk
+from src.text_processing.cache import normalize_text
+
+
+def query_hash(query_text: str) -> str:
+    """
+    Hashes a query so that questions differing only in case, unicode form or
+    whitespace share an entry. The bge model is uncased, so their embeddings
+    are identical.
+    """
+    return hashlib.sha256(
+        normalize_text(query_text).lower().encode("utf-8")
+    ).hexdigest()
+
+
+class RetrievalCache:
+    """
+    LRU of retrieval results per (user, data version, query hash, top_k), with a TTL.
+
+    Callers pass the user's current data version, so entries stored before the
+    user's vectors changed are simply never looked up again. The TTL bounds how
+    stale an entry can get if a version bump is lost.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, int, str, int], Tuple[float, List[RetrievedChunk]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "RetrievalCache":
+        return cls(
+            max_entries=int(os.getenv("RETRIEVAL_CACHE_MAX_ENTRIES", 1024)),
+            ttl_seconds=float(os.getenv("RETRIEVAL_CACHE_TTL_SECONDS", 60)),
+        )
+
+    def get(
+        self, user_id: str, version: int, query_text: str, top_k: int
+    ) -> Optional[List[RetrievedChunk]]:
+        key = (user_id, version, query_hash(query_text), top_k)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                RETRIEVAL_CACHE_MISSES.inc()
+                return None
+            self._entries.move_to_end(key)
+        RETRIEVAL_CACHE_HITS.inc()
+        return list(entry[1])
+
+    def put(
+        self,
+        user_id: str,
+        version: int,
+        query_text: str,
+        top_k: int,
+        results: List[RetrievedChunk],
+    ):
+        if self.max_entries <= 0:
+            return
+        key = (user_id, version, query_hash(query_text), top_k)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic(), list(results))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -0,0 +1,113 @@
+import os
+import uuid
+from typing import Dict, List
+
+from sqlalchemy.orm import Session
+
+from src.api.metrics import CHAT_CONTEXT_MODE
+from src.data_models.retrieval import RetrievedChunk
+from src.db.models import JournalEntry
+from src.interfaces.query_service import QueryService
+from src.llm.context import ContextPacker
+
+
+def format_entry_summary(entry) -> str:
+    """One compact line standing in for a whole journal entry."""
+    header = f"Entry {entry.entry_number} ({entry.created_at:%Y-%m-%d})"
+    if entry.title:
+        header += f" {entry.title}"
+    line = f"{header}: {entry.summary}"
+    if entry.keywords:
+        line += f" Keywords: {', '.join(entry.keywords)}."
+    themes = (entry.themes_topics or {}).get("identified_themes")
+    if themes:
+        line += f" Themes: {', '.join(themes)}."
+    return line
+
+
+class ChatContextBuilder:
+    """
+    Chooses what the chat prompt's context is made of.
+
+    A wide set of `summary_top_k` candidate hits is retrieved once. When the
+    raw text of the top `chunk_top_k` of them, which is what would be sent,
+    fits the context token budget, those chunks are the context. Otherwise,
+    as is typical of broad questions, each journal entry behind the
+    candidates is represented once by its stored analysis summary, fetched in
+    one query. Hits from uploaded documents and entries that have not been
+    analysed yet keep their raw text, at most `chunk_top_k` of them.
+    """
+
+    def __init__(
+        self,
+        query_service: QueryService,
+        db_session: Session,
+        context_packer: ContextPacker,
+    ):
+        self.query_service = query_service
+        self.db_session = db_session
+        self.context_packer = context_packer
+        self.chunk_top_k = int(os.getenv("RETRIEVAL_TOP_K", 5))
+        self.summary_top_k = max(
+            self.chunk_top_k, int(os.getenv("CHAT_SUMMARY_TOP_K", 20))
+        )
+
+    async def build(self, user_id: str, query_text: str) -> List[str]:
+        hits = await self.query_service.aquery(
+            user_id=user_id, query_text=query_text, top_k=self.summary_top_k
+        )
+        chunks = [hit.text for hit in hits[: self.chunk_top_k] if hit.text]
+        if self.context_packer.count_tokens(chunks) <= self.context_packer.token_budget:
+            CHAT_CONTEXT_MODE.labels(mode="chunks").inc()
+            return chunks
+
+        summaries = self._entry_summaries(user_id, hits)
+        if not summaries:
+            # Nothing behind the hits has been analysed, so the summary context
+            # would be these same chunks; the packer trims them to the budget.
+            CHAT_CONTEXT_MODE.labels(mode="chunks").inc()
+            return chunks
+
+        context, seen_entries, raw_texts = [], set(), 0
+        for hit in hits:
+            entry_id = hit.payload.get("journal_entry_id")
+            if entry_id in summaries:
+                if entry_id not in seen_entries:
+                    seen_entries.add(entry_id)
+                    context.append(summaries[entry_id])
+            elif hit.text and raw_texts < self.chunk_top_k:
+                raw_texts += 1
+                context.append(hit.text)
+        print(f"Using {len(summaries)} entry summaries as chat context.")
+        CHAT_CONTEXT_MODE.labels(mode="summaries").inc()
+        return context
+
+    def _entry_summaries(
+        self, user_id: str, hits: List[RetrievedChunk]
+    ) -> Dict[str, str]:
+        """Summary lines of the analysed entries behind the hits, by entry id."""
+        entry_ids = {
+            uuid.UUID(hit.payload["journal_entry_id"])
+            for hit in hits
+            if hit.payload.get("journal_entry_id")
+        }
+        if not entry_ids:
+            return {}
+        entries = (
+            self.db_session.query(
+                JournalEntry.id,
+                JournalEntry.entry_number,
+                JournalEntry.title,
+                JournalEntry.created_at,
+                JournalEntry.summary,
+                JournalEntry.keywords,
+                JournalEntry.themes_topics,
+            )
+            .filter(
+                JournalEntry.user_id == uuid.UUID(user_id),
+                JournalEntry.id.in_(entry_ids),
+                JournalEntry.summary.isnot(None),
+            )
+            .all()
+        )
+        return {str(entry.id): format_entry_summary(entry) for entry in entries}
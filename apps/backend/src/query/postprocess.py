@@ -0,0 +1,127 @@
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from src.data_models.retrieval import RetrievedChunk
+
+SOURCE_PAYLOAD_FIELDS = ("document_id", "journal_entry_id")
+
+
+def mmr_select(
+    chunks: List[RetrievedChunk],
+    k: int,
+    lambda_: float = 0.7,
+) -> List[RetrievedChunk]:
+    """
+    Picks `k` chunks by maximal marginal relevance: each pick maximizes
+    `lambda_ * relevance(chunk) - (1 - lambda_) * max sim(chunk, picked)`.
+
+    Relevance is the store's own score scaled to [0, 1] over the candidates,
+    so hybrid results keep their fused ranking, lexical matches included,
+    instead of being re-ranked by dense similarity alone. Embeddings are
+    L2-normalized, so dot products between them are cosine similarities.
+    Chunks without a vector keep their original rank after the MMR picks.
+    """
+    with_vectors = [chunk for chunk in chunks if chunk.vector is not None]
+    without_vectors = [chunk for chunk in chunks if chunk.vector is None]
+    if len(with_vectors) <= 1:
+        return (with_vectors + without_vectors)[:k]
+
+    vectors = np.stack([chunk.vector for chunk in with_vectors])
+    scores = np.asarray([chunk.score for chunk in with_vectors], dtype=np.float32)
+    spread = scores.max() - scores.min()
+    relevance = (scores - scores.min()) / spread if spread > 0 else np.ones_like(scores)
+    similarity = vectors @ vectors.T
+
+    picked: List[int] = []
+    # Highest similarity of each candidate to anything picked so far
+    redundancy = np.full(len(with_vectors), -np.inf, dtype=np.float32)
+    available = np.ones(len(with_vectors), dtype=bool)
+    while len(picked) < min(k, len(with_vectors)):
+        penalty = np.where(np.isfinite(redundancy), redundancy, 0.0)
+        mmr = lambda_ * relevance - (1 - lambda_) * penalty
+        mmr[~available] = -np.inf
+        best = int(np.argmax(mmr))
+        picked.append(best)
+        available[best] = False
+        redundancy = np.maximum(redundancy, similarity[best])
+
+    return ([with_vectors[i] for i in picked] + without_vectors)[:k]
+
+
+def _source_id(chunk: RetrievedChunk) -> Optional[str]:
+    for field in SOURCE_PAYLOAD_FIELDS:
+        if chunk.payload.get(field):
+            return f"{field}:{chunk.payload[field]}"
+    return None
+
+
+def _overlap(first: str, second: str, min_overlap: int, max_overlap: int) -> int:
+    """Length of the longest suffix of `first` that is also a prefix of `second`."""
+    for size in range(min(max_overlap, len(first), len(second)), min_overlap - 1, -1):
+        if first.endswith(second[:size]):
+            return size
+    return 0
+
+
+def _merge_pass(
+    chunks: List[RetrievedChunk], min_overlap: int, max_overlap: int
+) -> List[RetrievedChunk]:
+    merged: List[RetrievedChunk] = []
+    for chunk in chunks:
+        source = _source_id(chunk)
+        for i, kept in enumerate(merged):
+            if source is None or _source_id(kept) != source:
+                continue
+            forward = _overlap(kept.text, chunk.text, min_overlap, max_overlap)
+            if forward:
+                text = kept.text + chunk.text[forward:]
+            else:
+                backward = _overlap(chunk.text, kept.text, min_overlap, max_overlap)
+                if not backward:
+                    continue
+                text = chunk.text + kept.text[backward:]
+            merged[i] = RetrievedChunk(
+                id=kept.id,
+                score=max(kept.score, chunk.score),
+                text=text,
+                payload=kept.payload,
+                vector=kept.vector,
+            )
+            break
+        else:
+            merged.append(chunk)
+    return merged
+
+
+def merge_overlapping(
+    chunks: List[RetrievedChunk],
+    min_overlap: int = 20,
+    max_overlap: int = 200,
+) -> List[RetrievedChunk]:
+    """
+    Joins chunks of the same source that continue one another, i.e. where the
+    end of one repeats the start of the next, as the splitter's overlap does.
+    The merged chunk takes the place and id of the better-ranked one, and the
+    higher score. Repeats until no more chunks join, so runs of several
+    consecutive chunks end up as one.
+    """
+    while True:
+        merged = _merge_pass(chunks, min_overlap, max_overlap)
+        if len(merged) == len(chunks):
+            return merged
+        chunks = merged
+
+
+def without_vectors(chunks: Sequence[RetrievedChunk]) -> List[RetrievedChunk]:
+    """Drops the embeddings once they are no longer needed, e.g. before caching."""
+    return [
+        RetrievedChunk(
+            id=chunk.id,
+            score=chunk.score,
+            text=chunk.text,
+            payload=chunk.payload,
+            vector=None,
+        )
+        for chunk in chunks
+    ]
@@ -1,8 +1,19 @@
+import asyncio
+import os
 import uuid
-from typing import List, Dict, Any
+from typing import Any, Dict, List, Optional
 
+from src.data_models.retrieval import RetrievedChunk
+from src.interfaces.async_vector_store_client import AsyncVectorStoreClient
 from src.interfaces.query_service import QueryService
 from src.interfaces.vector_store_client import VectorStoreClient
+from src.query.cache import RetrievalCache
+from src.query.postprocess import (
+    SOURCE_PAYLOAD_FIELDS,
+    merge_overlapping,
+    mmr_select,
+    without_vectors,
+)
 from src.text_processing.service import EmbeddingService
 
 
@@ -11,17 +22,87 @@ class QueryServiceImpl(QueryService):
         self,
         embedding_service: EmbeddingService,
         vector_store_client: VectorStoreClient,
+        async_vector_store_client: Optional[AsyncVectorStoreClient] = None,
+        retrieval_cache: Optional[RetrievalCache] = None,
     ):
         self.embedding_service = embedding_service
         self.vector_store_client = vector_store_client
+        self.async_vector_store_client = async_vector_store_client
+        self.retrieval_cache = retrieval_cache
+        # Over-fetch `fetch_k` hits, then keep `top_k` diverse ones by MMR
+        self.top_k = int(os.getenv("RETRIEVAL_TOP_K", 5))
+        self.fetch_k = max(self.top_k, int(os.getenv("RETRIEVAL_FETCH_K", 20)))
+        self.mmr_lambda = float(os.getenv("RETRIEVAL_MMR_LAMBDA", 0.7))
 
-    def query(self, user_id: str, query_text: str) -> List[Dict[str, Any]]:
+    def _search_options(self, top_k: int) -> Dict[str, Any]:
+        return dict(
+            top_k=max(self.fetch_k, top_k),
+            payload_fields=SOURCE_PAYLOAD_FIELDS,
+            with_vectors=True,
+        )
+
+    def _postprocess(
+        self, hits: List[RetrievedChunk], top_k: int
+    ) -> List[RetrievedChunk]:
+        """
+        Selects `top_k` of the over-fetched hits by maximal marginal relevance,
+        then joins selected chunks that overlap within the same source, so the
+        context holds no near-duplicate text.
+        """
+        selected = mmr_select(hits, top_k, self.mmr_lambda)
+        return without_vectors(merge_overlapping(selected))
+
+    def _data_version(self, user_id: str) -> Optional[int]:
+        """
+        Returns the user's current data version for cache lookups, or None to
+        bypass the cache: when there is no cache, or when the version cannot be
+        read, in which case the query is served without it.
+        """
+        if self.retrieval_cache is None:
+            return None
+        try:
+            return self.vector_store_client.data_version(uuid.UUID(user_id))
+        except Exception as e:
+            print(f"Could not read the data version, skipping the cache: {e}")
+            return None
+
+    def _cached_results(
+        self, user_id: str, query_text: str, top_k: int, version: Optional[int]
+    ) -> Optional[List[RetrievedChunk]]:
+        """
+        Returns the cached results for the query under the user's data version,
+        if any. Hits skip both the model and the search.
+        """
+        if version is None:
+            return None
+        return self.retrieval_cache.get(user_id, version, query_text, top_k)
+
+    def _cache_results(
+        self,
+        user_id: str,
+        version: Optional[int],
+        query_text: str,
+        top_k: int,
+        results: List[RetrievedChunk],
+    ):
+        if version is not None:
+            self.retrieval_cache.put(user_id, version, query_text, top_k, results)
+
+    def query(
+        self, user_id: str, query_text: str, top_k: Optional[int] = None
+    ) -> List[RetrievedChunk]:
         """
         1. Embeds the query text.
         2. Queries the vector store for relevant chunks for the user.
-        3. Returns the results.
+        3. Diversifies and de-duplicates the hits, and returns them.
         """
         print(f"Querying for user '{user_id}' with text: '{query_text}'")
+        top_k = top_k or self.top_k
+        version = self._data_version(user_id)
+        cached = self._cached_results(user_id, query_text, top_k, version)
+        if cached is not None:
+            print(f"Found {len(cached)} cached results.")
+            return cached
 
         # 1. Embed the query text
         query_embedding = self.embedding_service.generate_embedding(query_text)
@@ -29,9 +110,79 @@ class QueryServiceImpl(QueryService):
         # 2. Query the vector store
         # Convert user_id string to UUID for the client
         user_uuid = uuid.UUID(user_id)
-        results = self.vector_store_client.query(
-            user_id=user_uuid, query_embedding=query_embedding
+        hits = self.vector_store_client.query(
+            user_id=user_uuid,
+            query_embedding=query_embedding,
+            query_text=query_text,
+            **self._search_options(top_k),
+        )
+        results = self._postprocess(hits, top_k)
+        self._cache_results(user_id, version, query_text, top_k, results)
+
+        print(f"Found {len(results)} results.")
+        return results
+
+    def query_many(
+        self, user_id: str, query_texts: List[str]
+    ) -> List[List[RetrievedChunk]]:
+        """
+        Embeds all uncached query texts in one batch and searches for them in
+        one vector store request.
+        """
+        print(f"Querying for user '{user_id}' with {len(query_texts)} texts")
+        results: List[Optional[List[RetrievedChunk]]] = []
+        version = self._data_version(user_id)
+        for query_text in query_texts:
+            results.append(
+                self._cached_results(user_id, query_text, self.top_k, version)
+            )
+
+        missing = [i for i, hits in enumerate(results) if hits is None]
+        if missing:
+            missing_texts = [query_texts[i] for i in missing]
+            query_embeddings = self.embedding_service.embed_chunks(missing_texts)
+            found = self.vector_store_client.query_batch(
+                user_id=uuid.UUID(user_id),
+                embeddings=query_embeddings,
+                query_texts=missing_texts,
+                **self._search_options(self.top_k),
+            )
+            for i, hits in zip(missing, found):
+                hits = self._postprocess(hits, self.top_k)
+                results[i] = hits
+                self._cache_results(user_id, version, query_texts[i], self.top_k, hits)
+
+        print(f"Found {sum(len(hits) for hits in results)} results.")
+        return results
+
+    async def aquery(
+        self, user_id: str, query_text: str, top_k: Optional[int] = None
+    ) -> List[RetrievedChunk]:
+        """
+        Same steps as `query`, awaiting the embedding and the vector search.
+        """
+        if self.async_vector_store_client is None:
+            raise RuntimeError("No async vector store client configured.")
+        print(f"Querying for user '{user_id}' with text: '{query_text}'")
+        top_k = top_k or self.top_k
+        # The version is read from Postgres, off the event loop
+        version = await asyncio.to_thread(self._data_version, user_id)
+        cached = self._cached_results(user_id, query_text, top_k, version)
+        if cached is not None:
+            print(f"Found {len(cached)} cached results.")
+            return cached
+
+        query_embedding = await self.embedding_service.agenerate_embedding(query_text)
+
+        user_uuid = uuid.UUID(user_id)
+        hits = await self.async_vector_store_client.query(
+            user_id=user_uuid,
+            query_embedding=query_embedding,
+            query_text=query_text,
+            **self._search_options(top_k),
         )
+        results = self._postprocess(hits, top_k)
+        self._cache_results(user_id, version, query_text, top_k, results)
 
         print(f"Found {len(results)} results.")
         return results
@@ -0,0 +1,104 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Sequence, Tuple
+
+import numpy as np
+
+
+def token_budget_batches(
+    token_lengths: Sequence[int], max_tokens_per_batch: int
+) -> List[List[int]]:
+    """
+    Groups item indices into batches of similar token length.
+
+    Items are taken longest first, and a batch is closed once padding every
+    member to the batch's longest item would exceed `max_tokens_per_batch`.
+    Each batch therefore pads short items only to a nearby length. A single
+    item longer than the budget still gets a batch of its own.
+    """
+    order = sorted(range(len(token_lengths)), key=lambda i: -token_lengths[i])
+    batches: List[List[int]] = []
+    for index in order:
+        if batches:
+            batch = batches[-1]
+            width = token_lengths[batch[0]]
+            if (len(batch) + 1) * width <= max_tokens_per_batch:
+                batch.append(index)
+                continue
+        batches.append([index])
+    return batches
+
+
+class EmbeddingMicroBatcher:
+    """
+    Coalesces concurrent single-text embedding requests into one model call.
+
+    Callers get a Future for their own row. A background thread takes the first
+    queued request, then keeps collecting until either `max_batch_size` requests
+    are pending or `max_wait_ms` has passed, and encodes them as one batch.
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[List[str]], np.ndarray],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ):
+        self._encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+    def submit(self, text: str) -> Future:
+        """Queues a text for embedding and returns a Future for its vector."""
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="embedding-micro-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def _collect_batch(self) -> List[Tuple[str, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_s
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = [
+                (text, future)
+                for text, future in self._collect_batch()
+                if future.set_running_or_notify_cancel()
+            ]
+            if not batch:
+                continue
+            try:
+                vectors = self._encode_fn([text for text, _ in batch])
+            except Exception as e:
+                logging.error(f"Embedding micro-batch of {len(batch)} failed: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(vector)
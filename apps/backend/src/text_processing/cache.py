@@ -0,0 +1,210 @@
+import fcntl
+import hashlib
+import logging
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.api.metrics import EMBEDDING_CACHE_HITS, EMBEDDING_CACHE_MISSES
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizes text before hashing so that inputs which only differ in unicode
+    form or whitespace share a cache entry. The bge tokenizer splits on
+    whitespace, so both variants produce the same tokens anyway.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def embedding_cache_key(text: str, model_name: str) -> str:
+    """Returns the content address of a text's embedding for a given model."""
+    digest = hashlib.sha256()
+    digest.update(model_name.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(normalize_text(text).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LRUEmbeddingCache:
+    """
+    In-process LRU of embedding rows, bounded by the total size of the stored arrays.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+            return vector
+
+    def put(self, key: str, vector: np.ndarray):
+        if vector.nbytes > self.max_bytes:
+            return
+        # Own the row so a cached entry never pins the whole batch it was sliced from
+        if vector.base is not None:
+            vector = vector.copy()
+        vector.setflags(write=False)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size_bytes -= previous.nbytes
+            self._entries[key] = vector
+            self._size_bytes += vector.nbytes
+            while self._size_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size_bytes -= evicted.nbytes
+
+
+class DiskEmbeddingStore:
+    """
+    Append-only on-disk store of float32 embedding rows, read through a memory map.
+
+    Rows are written back to back into a `.f32` file, and an index file records
+    one `<key> <row>` line per row. Appends are serialized with an exclusive file
+    lock so several worker processes can share the same directory.
+    """
+
+    def __init__(self, directory: str, model_name: str, dim: int):
+        os.makedirs(directory, exist_ok=True)
+        file_stem = hashlib.sha1(model_name.encode("utf-8")).hexdigest()[:12]
+        self.dim = dim
+        self._row_bytes = dim * np.dtype(np.float32).itemsize
+        self._vectors_path = os.path.join(directory, f"{file_stem}-{dim}.f32")
+        self._index_path = os.path.join(directory, f"{file_stem}-{dim}.idx")
+        self._rows: Dict[str, int] = {}
+        self._index_offset = 0
+        self._mmap: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+
+        for path in (self._vectors_path, self._index_path):
+            open(path, "ab").close()
+        with self._lock:
+            self._load_new_index_entries()
+
+    def _complete_rows(self) -> int:
+        return os.path.getsize(self._vectors_path) // self._row_bytes
+
+    def _load_new_index_entries(self):
+        """Reads index lines appended since the last load, including other processes' writes."""
+        complete_rows = self._complete_rows()
+        with open(self._index_path, "rb") as index_file:
+            index_file.seek(self._index_offset)
+            for line in index_file:
+                if not line.endswith(b"\n"):
+                    break
+                self._index_offset += len(line)
+                key, _, row = line.decode("ascii").strip().partition(" ")
+                if row.isdigit() and int(row) < complete_rows:
+                    self._rows[key] = int(row)
+
+    def _vector_at(self, row: int) -> np.ndarray:
+        if self._mmap is None or row >= self._mmap.shape[0]:
+            self._mmap = np.memmap(
+                self._vectors_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(self._complete_rows(), self.dim),
+            )
+        return np.array(self._mmap[row])
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                return None
+            return self._vector_at(row)
+
+    def put(self, key: str, vector: np.ndarray):
+        with self._lock:
+            if key in self._rows:
+                return
+            with open(self._vectors_path, "ab") as vectors_file:
+                fcntl.flock(vectors_file, fcntl.LOCK_EX)
+                try:
+                    row = os.fstat(vectors_file.fileno()).st_size // self._row_bytes
+                    vectors_file.write(
+                        np.ascontiguousarray(vector, dtype=np.float32).tobytes()
+                    )
+                    vectors_file.flush()
+                    with open(self._index_path, "ab") as index_file:
+                        index_file.write(f"{key} {row}\n".encode("ascii"))
+                finally:
+                    fcntl.flock(vectors_file, fcntl.LOCK_UN)
+            self._load_new_index_entries()
+
+
+class EmbeddingCache:
+    """
+    Two-tier, content-addressed cache of embeddings.
+
+    Lookups go to the in-process LRU first and fall back to the optional disk
+    store; disk hits are promoted into the LRU.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        dim: int,
+        max_bytes: int = 64 * 1024 * 1024,
+        directory: Optional[str] = None,
+    ):
+        self.model_name = model_name
+        self._memory = LRUEmbeddingCache(max_bytes)
+        self._disk: Optional[DiskEmbeddingStore] = None
+        if directory:
+            try:
+                self._disk = DiskEmbeddingStore(directory, model_name, dim)
+            except OSError as e:
+                logging.warning(
+                    f"Disk embedding cache at '{directory}' unavailable, using memory only: {e}"
+                )
+
+    @classmethod
+    def from_env(cls, model_name: str, dim: int) -> "EmbeddingCache":
+        return cls(
+            model_name=model_name,
+            dim=dim,
+            max_bytes=int(os.getenv("EMBEDDING_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+            directory=os.getenv("EMBEDDING_CACHE_DIR") or None,
+        )
+
+    def key(self, text: str) -> str:
+        return embedding_cache_key(text, self.model_name)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        vector = self._memory.get(key)
+        if vector is not None:
+            EMBEDDING_CACHE_HITS.labels(tier="memory").inc()
+            return vector
+
+        if self._disk is not None:
+            vector = self._disk.get(key)
+            if vector is not None:
+                EMBEDDING_CACHE_HITS.labels(tier="disk").inc()
+                self._memory.put(key, vector)
+                return vector
+
+        EMBEDDING_CACHE_MISSES.inc()
+        return None
+
+    def get_many(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        return [self.get(key) for key in keys]
+
+    def put(self, key: str, vector: np.ndarray):
+        self._memory.put(key, vector)
+        if self._disk is not None:
+            try:
+                self._disk.put(key, vector)
+            except OSError as e:
+                logging.warning(f"Failed to write embedding to disk cache: {e}")
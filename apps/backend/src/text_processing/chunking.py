@@ -1,9 +1,22 @@
+import hashlib
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from typing import List
+from typing import Iterable, Iterator, List, Optional
+
+
+def chunk_hash(chunk: str) -> str:
+    """Returns the content hash identifying a chunk's text."""
+    return hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+
+
+def iter_text_segments(text: str, segment_size: int = 64_000) -> Iterator[str]:
+    """Yields consecutive fixed-size slices of a text, for streaming it into a splitter."""
+    for start in range(0, len(text), segment_size):
+        yield text[start : start + segment_size]
 
 
 class TextSplitter:
     def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
+        self.chunk_size = chunk_size
         self._splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
@@ -13,3 +26,39 @@ class TextSplitter:
     def split_text(self, text: str) -> List[str]:
         """Splits a long text into smaller chunks."""
         return self._splitter.split_text(text)
+
+    def iter_chunks(
+        self, pages: Iterable[str], buffer_size: Optional[int] = None
+    ) -> Iterator[str]:
+        """
+        Splits a stream of text (e.g. pages or segments, concatenated as given)
+        into chunks, yielding them as soon as they are final.
+
+        Text is buffered until it holds `buffer_size` characters, then split.
+        The last chunk of each split may continue into the next page, so the
+        buffer restarts from where that chunk begins and it is only yielded
+        once more text has arrived or the stream ends.
+
+        The output is not guaranteed to match `split_text` on the whole text:
+        the splitter picks its separators per buffer, so a buffer without a
+        paragraph break that the whole text has can cut at different places.
+        Chunks feed the content-derived point ids, so a given source must
+        always be chunked the same way.
+        """
+        buffer_size = buffer_size or 8 * self.chunk_size
+        buffer = ""
+        for page in pages:
+            buffer += page
+            if len(buffer) < buffer_size:
+                continue
+
+            chunks = self.split_text(buffer)
+            if len(chunks) < 2:
+                continue
+            yield from chunks[:-1]
+            # Chunks are whitespace-stripped, so carry the raw tail of the buffer
+            tail_start = buffer.rfind(chunks[-1])
+            buffer = buffer[tail_start:] if tail_start != -1 else chunks[-1]
+
+        if buffer:
+            yield from self.split_text(buffer)
@@ -1,43 +1,163 @@
-from sentence_transformers import SentenceTransformer
-from typing import List, Union
+import asyncio
+import os
+from typing import Callable, List, Optional, Union
 import numpy as np
 
+from src.text_processing.backends import create_embedding_backend
+from src.text_processing.batching import EmbeddingMicroBatcher
+from src.text_processing.cache import EmbeddingCache
+from src.text_processing.workers import PooledEmbeddingBackend
+
+MODEL_NAME = "BAAI/bge-small-en-v1.5"
+
 
 class EmbeddingService:
     _instance = None
-    _model = None
+    _backend = None
+    _cache = None
+    _batcher = None
+    _dim = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(EmbeddingService, cls).__new__(cls)
             # Initialize the model only once
-            model_name = "BAAI/bge-small-en-v1.5"
+            model_name = MODEL_NAME
             print(f"Loading embedding model: {model_name}...")
             try:
-                cls._model = SentenceTransformer(model_name)
-                print("Embedding model loaded successfully.")
+                if os.getenv("EMBEDDING_EXECUTOR", "inline") == "process":
+                    # Worker processes hold the model; this one only tokenizes
+                    cls._backend = PooledEmbeddingBackend(model_name)
+                else:
+                    cls._backend = create_embedding_backend(model_name)
+                cls._dim = cls._backend.dim
+                # Backends produce slightly different vectors, so they never share entries
+                cls._cache = EmbeddingCache.from_env(
+                    f"{model_name}:{cls._backend.name}", cls._dim
+                )
+                print(
+                    f"Embedding model loaded successfully ({cls._backend.name} backend)."
+                )
             except Exception as e:
                 print(f"Failed to load embedding model: {e}")
-                cls._model = None
+                cls._backend = None
+            # Single-text requests from concurrent API calls share model batches
+            cls._batcher = EmbeddingMicroBatcher(
+                cls._instance._encode_and_store,
+                max_batch_size=int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", 32)),
+                max_wait_ms=float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", 5)),
+            )
         return cls._instance
 
+    @property
+    def backend_name(self) -> Optional[str]:
+        return self._backend.name if self._backend else None
+
+    def _encode_and_store(
+        self,
+        texts: List[str],
+        encoder: Optional[Callable[[List[str]], np.ndarray]] = None,
+    ) -> np.ndarray:
+        """
+        Runs the encoder (the in-process backend by default) on texts, each encoded
+        once, and writes the results to the cache.
+        Returns a (len(texts), dim) float32 array.
+        """
+        keys = [self._cache.key(text) for text in texts]
+        unique = dict(zip(keys, texts))
+        encoded = (encoder or self._backend.encode)(list(unique.values()))
+        fresh = dict(zip(unique.keys(), encoded))
+        for key, vector in fresh.items():
+            self._cache.put(key, vector)
+        return np.stack([fresh[key] for key in keys])
+
+    def _encode_cached(
+        self,
+        texts: List[str],
+        encoder: Optional[Callable[[List[str]], np.ndarray]] = None,
+    ) -> np.ndarray:
+        """
+        Returns a (len(texts), dim) float32 array of normalized embeddings.
+        Only texts missing from the cache are sent to the model.
+        """
+        keys = [self._cache.key(text) for text in texts]
+        vectors = self._cache.get_many(keys)
+
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            encoded = self._encode_and_store([texts[i] for i in missing], encoder)
+            for i, vector in zip(missing, encoded):
+                vectors[i] = vector
+
+        return np.stack(vectors)
+
+    def _encode_single(self, text: str) -> np.ndarray:
+        """
+        Embeds one text, coalescing cache misses with other concurrent callers.
+        """
+        vector = self._cache.get(self._cache.key(text))
+        if vector is not None:
+            return vector
+        if self._batcher.max_batch_size <= 1:
+            return self._encode_and_store([text])[0]
+        return self._batcher.submit(text).result()
+
+    def encode(
+        self,
+        texts: List[str],
+        encoder: Optional[Callable[[List[str]], np.ndarray]] = None,
+    ) -> np.ndarray:
+        """
+        Generates embeddings for a list of texts as one contiguous
+        (len(texts), dim) float32 array. Cache misses are embedded by `encoder`
+        if given, e.g. a worker pool, instead of the in-process model.
+        """
+        if not self._backend:
+            raise RuntimeError("Embedding model is not available.")
+        if not texts:
+            return np.empty((0, self._dim), dtype=np.float32)
+        return self._encode_cached(list(texts), encoder)
+
+    def encode_one(self, text: str) -> np.ndarray:
+        """
+        Generates the float32 embedding vector for a single text.
+        """
+        if not self._backend:
+            raise RuntimeError("Embedding model is not available.")
+        return self._encode_single(text)
+
+    async def aencode_one(self, text: str) -> np.ndarray:
+        """
+        Async `encode_one`: waits for the micro-batch without blocking the event loop.
+        """
+        if not self._backend:
+            raise RuntimeError("Embedding model is not available.")
+        vector = self._cache.get(self._cache.key(text))
+        if vector is not None:
+            return vector
+        if self._batcher.max_batch_size <= 1:
+            return (await asyncio.to_thread(self._encode_and_store, [text]))[0]
+        return await asyncio.wrap_future(self._batcher.submit(text))
+
+    def tokenize(self, texts: List[str]) -> List[List[int]]:
+        """Returns the model input ids of each text, unpadded."""
+        if not self._backend:
+            raise RuntimeError("Embedding model is not available.")
+        return self._backend.tokenize(texts)
+
+    def encode_token_ids(self, token_ids: List[List[int]]) -> np.ndarray:
+        """Embeds one batch of pre-tokenized texts on the in-process backend."""
+        if not self._backend:
+            raise RuntimeError("Embedding model is not available.")
+        return self._backend.encode_token_ids(token_ids)
+
     def get_embedding(
         self, text: Union[str, List[str]]
     ) -> Union[List[float], List[List[float]]]:
         """
-        Generates an embedding for a single text or a list of texts.
+        Generates an embedding for a single text or a list of texts as Python lists.
+        Prefer `encode`/`encode_one`, which keep the vectors as numpy arrays.
         """
-        if not self._model:
-            raise RuntimeError("Embedding model is not available.")
-
-        # The model's encode function can handle both a single sentence and a list of sentences.
-        embeddings = self._model.encode(text, normalize_embeddings=True)
-
-        # The output of encode can be a single numpy array or a list of numpy arrays.
-        # We convert them to a list of floats or a list of lists of floats.
-        if isinstance(embeddings, np.ndarray) and embeddings.ndim == 1:
-            return embeddings.tolist()
-        elif isinstance(embeddings, np.ndarray) and embeddings.ndim > 1:
-            return [arr.tolist() for arr in embeddings]
-        else:
-            return embeddings  # Should already be in a list format
+        if isinstance(text, str):
+            return self.encode_one(text).tolist()
+        return self.encode(text).tolist()
@@ -0,0 +1,124 @@
+"""
+Parity check between the fp32 embedding backend and a candidate backend.
+
+Encodes a fixed corpus with both backends and reports the cosine drift of the
+candidate's vectors, how well it preserves each text's nearest neighbours, and
+the encode latency of both.
+
+Usage (from apps/backend):
+    python -m src.text_processing.parity --backend int8
+"""
+
+import argparse
+import time
+from typing import List
+
+import numpy as np
+
+from src.text_processing.backends import EmbeddingBackend, create_embedding_backend
+from src.text_processing.embedding import MODEL_NAME
+
+PARITY_CORPUS = [
+    "Woke up early and went for a run along the beach before work.",
+    "I keep thinking about the argument with my sister last weekend.",
+    "Work was overwhelming today, three deadlines landed at once.",
+    "Had coffee with Sam and talked about moving to Melbourne next year.",
+    "Feeling grateful for the quiet evening and a good book.",
+    "My manager praised the presentation, which surprised me.",
+    "Couldn't sleep again. My mind keeps replaying the interview.",
+    "Started learning the guitar, my fingers hurt but it's fun.",
+    "Mum called to say the test results came back fine.",
+    "I notice I get anxious every Sunday night before the week starts.",
+    "Spent the afternoon gardening, planted tomatoes and basil.",
+    "We celebrated Priya's birthday at the new Thai place downtown.",
+    "I want to be more patient with myself when I make mistakes.",
+    "The project launch slipped again and the team is frustrated.",
+    "Walked the dog in the rain and felt oddly peaceful.",
+    "I've been skipping the gym, need to get back into a routine.",
+    "Reading old journal entries made me realise how much I've changed.",
+    "Dinner with Alex was tense, we avoided talking about money.",
+    "Finished the online course on data analysis today.",
+    "A stranger helped me carry groceries, small kindness made my day.",
+    "I'm worried about dad's health, he seemed tired on the phone.",
+    "Booked flights to Japan for the spring holidays.",
+    "Meditated for ten minutes, it's getting easier to focus.",
+    "Felt left out when the others made plans without me.",
+    "Cleaned out the garage and donated three boxes of old clothes.",
+    "Got feedback that my writing is too long-winded, fair point.",
+    "The kids were loud all day but bedtime stories were sweet.",
+    "Thinking about asking for a raise after the quarterly review.",
+    "Had a panic attack on the train, breathing exercises helped.",
+    "Long phone call with my best friend from university.",
+    "Sunday market haul: fresh bread, strawberries and flowers.",
+    "I realise I say yes to too many things and then resent it.",
+]
+
+
+def _timed_encode(backend: EmbeddingBackend, texts: List[str], repeats: int):
+    backend.encode(texts[:2])  # warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        vectors = backend.encode(texts)
+        timings.append(time.perf_counter() - start)
+    return vectors, float(np.median(timings))
+
+
+def _neighbour_recall(reference: np.ndarray, candidate: np.ndarray, k: int) -> float:
+    """Average overlap of each text's top-k neighbours under both backends."""
+
+    def top_k(vectors: np.ndarray) -> np.ndarray:
+        similarities = vectors @ vectors.T
+        np.fill_diagonal(similarities, -np.inf)
+        return np.argsort(-similarities, axis=1)[:, :k]
+
+    reference_top, candidate_top = top_k(reference), top_k(candidate)
+    overlaps = [
+        len(set(ref_row) & set(cand_row)) / k
+        for ref_row, cand_row in zip(reference_top, candidate_top)
+    ]
+    return float(np.mean(overlaps))
+
+
+def run_parity_check(backend_name: str, repeats: int = 5, k: int = 5) -> dict:
+    reference_backend = create_embedding_backend(MODEL_NAME, "fp32")
+    candidate_backend = create_embedding_backend(MODEL_NAME, backend_name)
+
+    reference, reference_latency = _timed_encode(
+        reference_backend, PARITY_CORPUS, repeats
+    )
+    candidate, candidate_latency = _timed_encode(
+        candidate_backend, PARITY_CORPUS, repeats
+    )
+
+    # Both backends return L2-normalized rows, so the row-wise dot is the cosine
+    cosines = np.sum(reference * candidate, axis=1)
+    return {
+        "backend": backend_name,
+        "corpus_size": len(PARITY_CORPUS),
+        "cosine_mean": float(cosines.mean()),
+        "cosine_min": float(cosines.min()),
+        "cosine_p5": float(np.percentile(cosines, 5)),
+        f"neighbour_recall_at_{k}": _neighbour_recall(reference, candidate, k),
+        "fp32_encode_seconds": reference_latency,
+        f"{backend_name}_encode_seconds": candidate_latency,
+        "speedup": reference_latency / candidate_latency,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backend", default="int8")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    report = run_parity_check(args.backend, repeats=args.repeats, k=args.k)
+    for name, value in report.items():
+        print(
+            f"{name}: {value:.4f}" if isinstance(value, float) else f"{name}: {value}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,13 @@
 import logging
-from typing import List, Tuple
+import os
+from typing import Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from src.text_processing.batching import token_budget_batches
 from src.text_processing.chunking import TextSplitter
-from src.text_processing.embedding import EmbeddingService
+from src.text_processing.embedding import EmbeddingService, MODEL_NAME
+from src.text_processing.workers import get_embedding_worker_pool
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -12,23 +18,104 @@ class TextProcessingService:
     def __init__(self):
         self._text_splitter = TextSplitter()
         self._embedding_service = EmbeddingService()
+        self._max_tokens_per_batch = int(
+            os.getenv("EMBEDDING_MAX_TOKENS_PER_BATCH", 16384)
+        )
+        # "inline" embeds on this process's model, "process" spreads chunk
+        # batches over a pool of worker processes and this process only loads
+        # the tokenizer.
+        self._encode_token_batches = self._encode_token_batches_inline
+        if os.getenv("EMBEDDING_EXECUTOR", "inline") == "process":
+            self._encode_token_batches = get_embedding_worker_pool(
+                MODEL_NAME, self._embedding_service.backend_name
+            ).encode_token_batches
+
+    def _encode_token_batches_inline(
+        self, token_batches: List[List[List[int]]]
+    ) -> List[np.ndarray]:
+        return [
+            self._embedding_service.encode_token_ids(batch) for batch in token_batches
+        ]
+
+    def _encode_bucketed(self, texts: List[str]) -> np.ndarray:
+        """
+        Tokenizes texts once, encodes them in batches of similar token length
+        under the max-tokens-per-batch budget, and restores the input order.
+        """
+        token_ids = self._embedding_service.tokenize(texts)
+        buckets = token_budget_batches(
+            [len(ids) for ids in token_ids], self._max_tokens_per_batch
+        )
+        encoded = self._encode_token_batches(
+            [[token_ids[i] for i in bucket] for bucket in buckets]
+        )
+
+        embeddings = np.empty((len(texts), encoded[0].shape[1]), dtype=np.float32)
+        for bucket, vectors in zip(buckets, encoded):
+            embeddings[bucket] = vectors
+        return embeddings
+
+    def split_text(self, text: str) -> List[str]:
+        """Splits a raw text string into chunks without embedding them."""
+        return self._text_splitter.split_text(text)
+
+    def embed_chunks(self, chunks: List[str]) -> np.ndarray:
+        """
+        Embeds already-split chunks as one (len(chunks), dim) float32 array.
+        """
+        return self._embedding_service.encode(chunks, encoder=self._encode_bucketed)
 
-    def process_text(self, text: str) -> Tuple[List[str], List[List[float]]]:
+    def process_text(self, text: str) -> Tuple[List[str], np.ndarray]:
         """
         Processes a raw text string by chunking it and then creating embeddings for each chunk.
+        The embeddings are returned as one (len(chunks), dim) float32 array.
         """
         logging.info("Starting text chunking...")
         text_chunks = self._text_splitter.split_text(text)
         logging.info(f"Created {len(text_chunks)} text chunks.")
 
         logging.info("Starting chunk embedding...")
-        embeddings = self._embedding_service.get_embedding(text_chunks)
+        embeddings = self.embed_chunks(text_chunks)
         logging.info("Chunk embedding complete.")
 
         return text_chunks, embeddings
 
-    def generate_embedding(self, text: str) -> List[float]:
+    def iter_chunk_windows(
+        self, pages: Iterable[str], window_size: int = 64
+    ) -> Iterator[List[str]]:
+        """
+        Splits chunks incrementally from `pages` and yields them in windows of
+        `window_size`, without embedding them.
+        """
+        window: List[str] = []
+        for chunk in self._text_splitter.iter_chunks(pages):
+            window.append(chunk)
+            if len(window) == window_size:
+                yield window
+                window = []
+        if window:
+            yield window
+
+    def process_text_stream(
+        self, pages: Iterable[str], window_size: int = 64
+    ) -> Iterator[Tuple[List[str], np.ndarray]]:
+        """
+        Streaming counterpart of `process_text` for very large documents.
+        Chunks are split incrementally from `pages` and embedded in windows of
+        `window_size`, each yielded as (chunks, embeddings) so callers can store
+        early windows while later pages are still being split.
+        """
+        for window in self.iter_chunk_windows(pages, window_size):
+            yield window, self.embed_chunks(window)
+
+    def generate_embedding(self, text: str) -> np.ndarray:
         """
         Generates an embedding for a single piece of text without chunking.
         """
-        return self._embedding_service.get_embedding(text)
+        return self._embedding_service.encode_one(text)
+
+    async def agenerate_embedding(self, text: str) -> np.ndarray:
+        """
+        Async `generate_embedding` for use from request handlers.
+        """
+        return await self._embedding_service.aencode_one(text)
@@ -0,0 +1,65 @@
+import hashlib
+import re
+from collections import Counter
+from typing import List, Tuple
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+STOPWORDS = frozenset(
+    """
+    a about after again all am an and any are as at be because been before being
+    but by can could did do does doing for from had has have having he her here
+    hers him his how i if in into is it its just me more most my no nor not of
+    off on once only or other our ours out over own same she should so some such
+    than that the their theirs them then there these they this those through to
+    too under until up very was we were what when where which while who whom why
+    will with would you your yours
+    """.split()
+)
+
+
+class SparseTextEncoder:
+    """
+    BM25-style lexical vectors computed locally, as (indices, values) pairs.
+
+    Terms are hashed to 32-bit indices so no vocabulary has to be kept. Document
+    values carry BM25's saturated term frequency with length normalization; the
+    IDF part is left to the vector store, which knows the corpus statistics.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, avg_doc_length: float = 150.0):
+        self.k1 = k1
+        self.b = b
+        self.avg_doc_length = avg_doc_length
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Lowercased word tokens, without stopwords and single characters."""
+        return [
+            token
+            for token in TOKEN_PATTERN.findall(text.lower())
+            if len(token) > 1 and token not in STOPWORDS
+        ]
+
+    @staticmethod
+    def term_index(term: str) -> int:
+        return int.from_bytes(
+            hashlib.blake2b(term.encode("utf-8"), digest_size=4).digest(), "little"
+        )
+
+    def encode_document(self, text: str) -> Tuple[List[int], List[float]]:
+        tokens = self.tokenize(text)
+        length_norm = self.k1 * (
+            1 - self.b + self.b * len(tokens) / self.avg_doc_length
+        )
+        weights = {}
+        for term, tf in Counter(tokens).items():
+            index = self.term_index(term)
+            weights[index] = weights.get(index, 0.0) + tf * (self.k1 + 1) / (
+                tf + length_norm
+            )
+        return list(weights), list(weights.values())
+
+    def encode_query(self, text: str) -> Tuple[List[int], List[float]]:
+        indices = sorted({self.term_index(term) for term in self.tokenize(text)})
+        return indices, [1.0] * len(indices)
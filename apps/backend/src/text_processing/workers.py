@@ -0,0 +1,189 @@
+import logging
+import multiprocessing as mp
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.text_processing.backends import (
+    EMBEDDING_BACKENDS,
+    EmbeddingBackend,
+    create_embedding_backend,
+)
+
+# Set in each worker process by _init_worker
+_worker_backend = None
+
+
+def _available_cores() -> List[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _init_worker(
+    model_name: str,
+    backend_name: Optional[str],
+    threads_per_worker: int,
+    core_slices,
+    slot_counter,
+):
+    """Pins the worker to its share of cores and loads the model once."""
+    global _worker_backend
+    with slot_counter.get_lock():
+        slot = slot_counter.value
+        slot_counter.value += 1
+
+    cores = core_slices[slot % len(core_slices)]
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+
+    import torch
+
+    torch.set_num_threads(threads_per_worker)
+    _worker_backend = create_embedding_backend(model_name, backend_name)
+    logging.info(
+        f"Embedding worker {os.getpid()} ready on cores {cores or 'unpinned'} "
+        f"with {threads_per_worker} threads."
+    )
+
+
+def _encode_token_batch(token_ids: List[List[int]]) -> np.ndarray:
+    return _worker_backend.encode_token_ids(token_ids)
+
+
+def _describe_worker_model() -> Tuple[int, int]:
+    return _worker_backend.dim, _worker_backend.max_seq_length
+
+
+class EmbeddingWorkerPool:
+    """
+    A pool of embedding processes, each with its own copy of the model and its
+    own slice of CPU cores. Batches submitted from several threads are spread
+    across the workers, and results come back in submission order.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        backend_name: Optional[str],
+        num_workers: int,
+        threads_per_worker: Optional[int] = None,
+    ):
+        cores = _available_cores()
+        threads_per_worker = threads_per_worker or max(1, len(cores) // num_workers)
+        if threads_per_worker * num_workers <= len(cores):
+            core_slices = [
+                cores[i * threads_per_worker : (i + 1) * threads_per_worker]
+                for i in range(num_workers)
+            ]
+        else:
+            # Not enough cores for disjoint slices, let the OS schedule the workers
+            core_slices = [[]]
+
+        # Spawn rather than fork: the parent may already have torch threads running
+        context = mp.get_context("spawn")
+        self._executor = ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(
+                model_name,
+                backend_name,
+                threads_per_worker,
+                core_slices,
+                context.Value("i", 0),
+            ),
+        )
+        print(
+            f"Started embedding worker pool with {num_workers} processes, "
+            f"{threads_per_worker} threads each."
+        )
+
+    def encode_token_batches(
+        self, token_batches: List[List[List[int]]]
+    ) -> List[np.ndarray]:
+        """
+        Embeds batches of pre-tokenized texts across the workers.
+        Returns one float32 array per batch, in the order given.
+        """
+        return list(self._executor.map(_encode_token_batch, token_batches))
+
+    def model_info(self) -> Tuple[int, int]:
+        """Returns the workers' embedding dimension and max sequence length."""
+        return self._executor.submit(_describe_worker_model).result()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+_shared_pool: Optional[EmbeddingWorkerPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_embedding_worker_pool(
+    model_name: str, backend_name: Optional[str]
+) -> EmbeddingWorkerPool:
+    """
+    Returns the process-wide worker pool, starting it on first use.
+    Sized by EMBEDDING_WORKERS and EMBEDDING_THREADS_PER_WORKER.
+    """
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            threads_per_worker = os.getenv("EMBEDDING_THREADS_PER_WORKER")
+            _shared_pool = EmbeddingWorkerPool(
+                model_name=model_name,
+                backend_name=backend_name,
+                num_workers=int(
+                    os.getenv("EMBEDDING_WORKERS", max(1, len(_available_cores()) // 2))
+                ),
+                threads_per_worker=int(threads_per_worker)
+                if threads_per_worker
+                else None,
+            )
+        return _shared_pool
+
+
+class PooledEmbeddingBackend(EmbeddingBackend):
+    """
+    Tokenizes in this process and embeds on the shared worker pool, so a
+    process that hands its batches to the workers only holds the model's
+    tokenizer instead of another copy of the model.
+    """
+
+    def __init__(self, model_name: str, backend_name: Optional[str] = None):
+        from transformers import AutoTokenizer
+
+        # The workers' backend, so cached vectors stay keyed by what made them
+        self.name = backend_name or os.getenv("EMBEDDING_BACKEND", "fp32")
+        if self.name not in EMBEDDING_BACKENDS:
+            raise ValueError(
+                f"Unknown embedding backend '{self.name}'. "
+                f"Expected one of: {', '.join(EMBEDDING_BACKENDS)}"
+            )
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self._pool = get_embedding_worker_pool(model_name, self.name)
+        # Asked of a worker, so truncation matches the model's own tokenize
+        self._dim, self.max_seq_length = self._pool.model_info()
+
+    @property
+    def dim(self) -> int:
+        return self._dim
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return self.encode_token_ids(self.tokenize(texts))
+
+    def tokenize(self, texts: List[str]) -> List[List[int]]:
+        return self.tokenizer(
+            texts,
+            truncation=True,
+            max_length=self.max_seq_length,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+        )["input_ids"]
+
+    def encode_token_ids(self, token_ids: List[List[int]]) -> np.ndarray:
+        return self._pool.encode_token_batches([token_ids])[0]
@@ -1,90 +1,676 @@
 import uuid
-from typing import List, Dict, Any
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
+from typing import List, Dict, Any, Iterable, Optional, Sequence, Set, Union
 import os
+import threading
 from datetime import datetime, timezone
 
+import numpy as np
 from qdrant_client import QdrantClient, models
-from qdrant_client.http.models import Distance, VectorParams, PointStruct
+from qdrant_client.http.models import Distance, VectorParams
 
+from src.data_models.retrieval import RetrievedChunk
 from src.interfaces.vector_store_client import VectorStoreClient
+from src.text_processing.sparse import SparseTextEncoder
+from src.vector_store.ids import point_id_for_chunk
+from src.vector_store.versions import bump_data_versions, get_data_version
 
 
-class QdrantVectorStoreClient(VectorStoreClient):
+def user_filter(user_id: uuid.UUID) -> models.Filter:
+    """Restricts a search to the points owned by one user."""
+    return models.Filter(
+        must=[
+            models.FieldCondition(
+                key="user_id", match=models.MatchValue(value=str(user_id))
+            )
+        ]
+    )
+
+
+def payload_selector(payload_fields: Optional[Sequence[str]] = None) -> List[str]:
+    """Payload fields fetched for each hit: the text plus any requested extras."""
+    return ["text", *(field for field in payload_fields or () if field != "text")]
+
+
+def vector_selector(with_vectors: bool) -> Union[bool, List[str]]:
+    """Vectors fetched for each hit: the dense one only, never the sparse one."""
+    return [""] if with_vectors else False
+
+
+def to_retrieved_chunks(hits: Iterable[models.ScoredPoint]) -> List[RetrievedChunk]:
+    chunks = []
+    for hit in hits:
+        payload = dict(hit.payload or {})
+        vector = hit.vector
+        if isinstance(vector, dict):
+            # Vectors selected by name come back keyed by name
+            vector = vector.get("")
+        chunks.append(
+            RetrievedChunk(
+                id=str(hit.id),
+                score=hit.score,
+                text=payload.pop("text", ""),
+                payload=payload,
+                vector=None if vector is None else np.asarray(vector, np.float32),
+            )
+        )
+    return chunks
+
+
+QUANTIZATION_MODES = ("none", "scalar", "binary")
+
+
+def quantization_mode() -> str:
+    """Returns the vector quantization named by QDRANT_QUANTIZATION (default "none")."""
+    mode = os.getenv("QDRANT_QUANTIZATION", "none").lower()
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(
+            f"Unknown QDRANT_QUANTIZATION '{mode}'. "
+            f"Expected one of: {', '.join(QUANTIZATION_MODES)}"
+        )
+    return mode
+
+
+def search_params() -> models.SearchParams:
+    """
+    If the collection is quantized, the quantized index fetches `oversampling`
+    times as many candidates, which are then rescored against the original
+    vectors. Qdrant ignores these parameters on an unquantized collection, so
+    they are sent regardless of QDRANT_QUANTIZATION in this process.
+    """
+    return models.SearchParams(
+        quantization=models.QuantizationSearchParams(
+            rescore=True,
+            oversampling=float(os.getenv("QDRANT_QUANTIZATION_OVERSAMPLING", 2.0)),
+        )
+    )
 
+
+SPARSE_VECTOR_NAME = "text-sparse"
+QUERY_MODES = ("dense", "hybrid")
+
+
+def query_mode() -> str:
+    """Returns the retrieval mode named by QDRANT_QUERY_MODE (default "hybrid")."""
+    mode = os.getenv("QDRANT_QUERY_MODE", "hybrid").lower()
+    if mode not in QUERY_MODES:
+        raise ValueError(
+            f"Unknown QDRANT_QUERY_MODE '{mode}'. "
+            f"Expected one of: {', '.join(QUERY_MODES)}"
+        )
+    return mode
+
+
+def hybrid_query_request(
+    user_id: uuid.UUID,
+    query_embedding: Union[List[float], np.ndarray],
+    query_text: str,
+    top_k: int,
+    sparse_encoder: SparseTextEncoder,
+    payload_fields: Optional[Sequence[str]] = None,
+    with_vectors: bool = False,
+) -> models.QueryRequest:
+    """
+    A query that runs the dense and the sparse search as prefetches of one
+    request, merged server-side by reciprocal rank fusion.
+    """
+    query_filter = user_filter(user_id)
+    prefetch_limit = max(top_k, int(os.getenv("QDRANT_HYBRID_PREFETCH_LIMIT", 20)))
+    prefetch = [
+        models.Prefetch(
+            query=np.asarray(query_embedding, dtype=np.float32).tolist(),
+            filter=query_filter,
+            params=search_params(),
+            limit=prefetch_limit,
+        )
+    ]
+    indices, values = sparse_encoder.encode_query(query_text)
+    if indices:
+        prefetch.append(
+            models.Prefetch(
+                query=models.SparseVector(indices=indices, values=values),
+                using=SPARSE_VECTOR_NAME,
+                filter=query_filter,
+                limit=prefetch_limit,
+            )
+        )
+    return models.QueryRequest(
+        prefetch=prefetch,
+        query=models.FusionQuery(fusion=models.Fusion.RRF),
+        filter=query_filter,
+        limit=top_k,
+        with_payload=payload_selector(payload_fields),
+        with_vector=vector_selector(with_vectors),
+    )
+
+
+class QdrantVectorStoreClient(VectorStoreClient):
     COLLECTION_NAME = "journal-chunks"
 
+    # Every query filters on the owner, so it is indexed as the tenant key.
+    # The per-source ids are plain keyword indexes for lookups and deletes.
+    TENANT_PAYLOAD_FIELD = "user_id"
+    KEYWORD_PAYLOAD_FIELDS = ("journal_entry_id", "document_id")
+
     def __init__(self):
         qdrant_url = os.getenv("QDRANT_URL", "http://localhost:6333")
-        self.client = QdrantClient(url=qdrant_url)
+        # gRPC sends vectors as packed floats instead of JSON text
+        self.client = QdrantClient(
+            url=qdrant_url,
+            prefer_grpc=os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true",
+            grpc_port=int(os.getenv("QDRANT_GRPC_PORT", 6334)),
+        )
+        self.upsert_batch_size = int(os.getenv("QDRANT_UPSERT_BATCH_SIZE", 256))
+        self._upsert_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("QDRANT_UPSERT_PARALLEL", 4)),
+            thread_name_prefix="qdrant-upsert",
+        )
+        self._pending_upserts: Set[Future] = set()
+        self._pending_lock = threading.Lock()
+        self._sparse_encoder = SparseTextEncoder()
+        # Only collections created with the sparse vector can store or search it
+        self.sparse_enabled = False
         self._ensure_collection_exists()
 
+    @staticmethod
+    def _hnsw_config() -> models.HnswConfigDiff:
+        """
+        By default the global HNSW graph is disabled (m=0) and a graph is built
+        per user_id value (payload_m). Search cost then follows the size of
+        the user's own data instead of the whole collection.
+        """
+        return models.HnswConfigDiff(
+            m=int(os.getenv("QDRANT_HNSW_M", 0)),
+            payload_m=int(os.getenv("QDRANT_HNSW_PAYLOAD_M", 16)),
+            ef_construct=int(os.getenv("QDRANT_HNSW_EF_CONSTRUCT", 100)),
+        )
+
+    @staticmethod
+    def _quantization_config() -> Optional[models.QuantizationConfig]:
+        """
+        Opt-in quantization, applied by `migrate_collection` only. The
+        quantized vectors stay in RAM while the float32 originals, only read
+        for rescoring, are kept on disk.
+        """
+        mode = quantization_mode()
+        if mode == "scalar":
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8, quantile=0.99, always_ram=True
+                )
+            )
+        if mode == "binary":
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=True)
+            )
+        return None
+
+    @staticmethod
+    def _optimizers_config() -> models.OptimizersConfigDiff:
+        return models.OptimizersConfigDiff(
+            indexing_threshold=int(os.getenv("QDRANT_INDEXING_THRESHOLD_KB", 20000)),
+        )
+
     def _ensure_collection_exists(self):
-        """Creates the Qdrant collection if it doesn't exist."""
+        """
+        Creates the Qdrant collection and its payload indexes if missing. An
+        existing collection's config is only changed by `migrate_collection`.
+        """
         try:
-            collections = self.client.get_collections().collections
-            collection_names = [collection.name for collection in collections]
-
-            if self.COLLECTION_NAME not in collection_names:
+            if not self.client.collection_exists(self.COLLECTION_NAME):
                 print(f"Collection '{self.COLLECTION_NAME}' not found. Creating it...")
-                self.client.recreate_collection(
+                self.client.create_collection(
                     collection_name=self.COLLECTION_NAME,
                     vectors_config=VectorParams(size=384, distance=Distance.COSINE),
+                    hnsw_config=self._hnsw_config(),
+                    optimizers_config=self._optimizers_config(),
+                    sparse_vectors_config={
+                        SPARSE_VECTOR_NAME: models.SparseVectorParams(
+                            modifier=models.Modifier.IDF
+                        )
+                    },
                 )
                 print("Collection created successfully.")
+            sparse_vectors = self.client.get_collection(
+                self.COLLECTION_NAME
+            ).config.params.sparse_vectors
+            self.sparse_enabled = SPARSE_VECTOR_NAME in (sparse_vectors or {})
+            if not self.sparse_enabled:
+                print(
+                    f"Collection '{self.COLLECTION_NAME}' has no '{SPARSE_VECTOR_NAME}' "
+                    "vector; recreate it to enable hybrid retrieval."
+                )
+            self._ensure_payload_indexes()
         except Exception as e:
             print(f"Failed to check or create Qdrant collection: {e}")
 
+    def migrate_collection(self):
+        """
+        Applies the current HNSW, optimizer and quantization parameters to an
+        existing collection. Quantization follows QDRANT_QUANTIZATION in this
+        process and is disabled when it is unset. Qdrant rebuilds the affected indexes in the
+        background. Run through `python -m src.vector_store.migrate`.
+        """
+        # The tenant index has to exist before the global graph is turned off
+        # (m=0), so the rebuild can fall back on per-user graphs.
+        self._ensure_payload_indexes()
+        quantization_config = self._quantization_config()
+        self.client.update_collection(
+            collection_name=self.COLLECTION_NAME,
+            vectors_config={
+                "": models.VectorParamsDiff(on_disk=quantization_config is not None)
+            },
+            hnsw_config=self._hnsw_config(),
+            optimizers_config=self._optimizers_config(),
+            quantization_config=quantization_config or models.Disabled.DISABLED,
+        )
+        print(f"Applied index configuration to collection '{self.COLLECTION_NAME}'.")
+
+    def _ensure_payload_indexes(self):
+        """Creates any missing payload indexes."""
+        payload_schema = self.client.get_collection(self.COLLECTION_NAME).payload_schema
+        wanted_indexes = {
+            self.TENANT_PAYLOAD_FIELD: models.KeywordIndexParams(
+                type=models.KeywordIndexType.KEYWORD, is_tenant=True
+            ),
+            **{
+                field: models.KeywordIndexParams(type=models.KeywordIndexType.KEYWORD)
+                for field in self.KEYWORD_PAYLOAD_FIELDS
+            },
+        }
+        for field, field_schema in wanted_indexes.items():
+            if field in payload_schema:
+                continue
+            self.client.create_payload_index(
+                collection_name=self.COLLECTION_NAME,
+                field_name=field,
+                field_schema=field_schema,
+                wait=True,
+            )
+            print(f"Created payload index on '{field}'.")
+
     def add_documents(self, user_id: uuid.UUID, documents: List[Dict[str, Any]]):
         """
         Upserts documents (chunks) into Qdrant, associated with a user_id.
         """
-        points = []
-        for doc in documents:
-            point_id = str(uuid.uuid4())
-            vector = doc.get("vector")
-            text = doc.get("text")
+        valid_documents = [
+            doc for doc in documents if doc.get("vector") and doc.get("text")
+        ]
+        if not valid_documents:
+            print("No valid documents to add.")
+            return
 
-            if not vector or not text:
-                continue
+        self.add_embeddings(
+            user_id=user_id,
+            texts=[doc["text"] for doc in valid_documents],
+            embeddings=np.asarray(
+                [doc["vector"] for doc in valid_documents], dtype=np.float32
+            ),
+        )
 
-            points.append(
-                PointStruct(
-                    id=point_id,
-                    vector=vector,
-                    payload={
-                        "user_id": str(user_id),
-                        "text": text,
-                        "created_at": datetime.now(timezone.utc).isoformat(),
-                    },
+    def add_embeddings(
+        self,
+        user_id: uuid.UUID,
+        texts: List[str],
+        embeddings: np.ndarray,
+        payload: Optional[Dict[str, Any]] = None,
+        ids: Optional[List[str]] = None,
+        wait: bool = True,
+    ) -> List[Future]:
+        """
+        Upserts chunks into Qdrant from a (len(texts), dim) embedding array.
+
+        Rows are split into batches of `upsert_batch_size` that are sent in
+        parallel, each with the chunks' sparse lexical vectors when the
+        collection has them. Vectors are only serialized one batch at a
+        time. With `wait=False` the call returns as soon as the batches are
+        queued; the returned futures can be passed to `flush` when the caller
+        needs to read its own writes.
+        """
+        if len(texts) != embeddings.shape[0]:
+            raise ValueError(
+                f"Got {len(texts)} texts but {embeddings.shape[0]} embeddings."
+            )
+        if ids is not None and len(ids) != len(texts):
+            raise ValueError(f"Got {len(texts)} texts but {len(ids)} ids.")
+        if ids is None:
+            source_id = (payload or {}).get("document_id") or (payload or {}).get(
+                "journal_entry_id", ""
+            )
+            ids = [point_id_for_chunk(user_id, source_id, text) for text in texts]
+        if not texts:
+            print("No valid documents to add.")
+            return []
+
+        futures = self.add_embeddings_bulk(
+            user_ids=[user_id] * len(texts),
+            texts=texts,
+            embeddings=embeddings,
+            payloads=[payload or {}] * len(texts),
+            ids=ids,
+            wait=wait,
+        )
+        if wait:
+            print(f"Upserted {len(texts)} points for user {user_id}")
+        return futures
+
+    def add_embeddings_bulk(
+        self,
+        user_ids: List[uuid.UUID],
+        texts: List[str],
+        embeddings: np.ndarray,
+        payloads: List[Dict[str, Any]],
+        ids: List[str],
+        wait: bool = True,
+    ) -> List[Future]:
+        """
+        Upserts chunks of several users and sources in one pass: row i belongs
+        to `user_ids[i]` and carries `payloads[i]`. Batching and `wait` work
+        as in `add_embeddings`.
+        """
+        if not len(user_ids) == len(texts) == len(payloads) == len(ids):
+            raise ValueError(
+                "user_ids, texts, payloads and ids must be the same length."
+            )
+        if len(texts) != embeddings.shape[0]:
+            raise ValueError(
+                f"Got {len(texts)} texts but {embeddings.shape[0]} embeddings."
+            )
+
+        created_at = datetime.now(timezone.utc).isoformat()
+        full_payloads = [
+            {**payload, "user_id": str(user_id), "created_at": created_at, "text": text}
+            for user_id, payload, text in zip(user_ids, payloads, texts)
+        ]
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+        futures = []
+        for start in range(0, len(texts), self.upsert_batch_size):
+            end = start + self.upsert_batch_size
+            futures.append(
+                self._submit_upsert(
+                    set(user_ids[start:end]),
+                    vectors[start:end],
+                    texts[start:end],
+                    full_payloads[start:end],
+                    ids[start:end],
                 )
             )
 
-        if not points:
-            print("No valid documents to add.")
+        if wait:
+            self.flush(futures)
+        return futures
+
+    def _upload_batch(
+        self,
+        user_ids: Set[uuid.UUID],
+        vectors: np.ndarray,
+        texts: List[str],
+        payloads: List[Dict[str, Any]],
+        ids: List[str],
+    ):
+        # Both writes wait server-side inside the background thread, which is
+        # what lets a completed future act as a read-after-write barrier.
+        # The ndarray slice is handed to the columnar upload as-is.
+        self.client.upload_collection(
+            collection_name=self.COLLECTION_NAME,
+            vectors=vectors,
+            payload=payloads,
+            ids=ids,
+            batch_size=len(ids),
+            wait=True,
+        )
+        if self.sparse_enabled:
+            # The columnar upload only takes dense arrays, so the sparse
+            # lexical vectors are attached to the new points in a second call.
+            self.client.update_vectors(
+                collection_name=self.COLLECTION_NAME,
+                points=[
+                    models.PointVectors(
+                        id=point_id,
+                        vector={
+                            SPARSE_VECTOR_NAME: models.SparseVector(
+                                indices=indices, values=values
+                            )
+                        },
+                    )
+                    for point_id, (indices, values) in zip(
+                        ids, map(self._sparse_encoder.encode_document, texts)
+                    )
+                ],
+                wait=True,
+            )
+        self._bump_data_versions(user_ids)
+
+    def _submit_upsert(
+        self,
+        user_ids: Set[uuid.UUID],
+        vectors: np.ndarray,
+        texts: List[str],
+        payloads: List[Dict[str, Any]],
+        ids: List[str],
+    ) -> Future:
+        # Vectors are serialized in the worker thread, one batch at a time
+        future = self._upsert_executor.submit(
+            self._upload_batch, user_ids, vectors, texts, payloads, ids
+        )
+        with self._pending_lock:
+            self._pending_upserts.add(future)
+        future.add_done_callback(self._forget_upsert)
+        return future
+
+    def _forget_upsert(self, future: Future):
+        with self._pending_lock:
+            self._pending_upserts.discard(future)
+
+    def flush(self, futures: Optional[List[Future]] = None):
+        """
+        Blocks until the given upserts (or every pending one) are applied,
+        re-raising the first failure.
+        """
+        if futures is None:
+            with self._pending_lock:
+                futures = list(self._pending_upserts)
+        wait_futures(futures)
+        for future in futures:
+            future.result()
+
+    def _bump_data_versions(self, user_ids: Iterable[uuid.UUID]):
+        # Bumped after the write is applied, so results read before it can
+        # only ever be stored under the old version. The write itself has
+        # succeeded, so a failed bump only leaves caches stale until their TTL.
+        try:
+            bump_data_versions(user_ids)
+        except Exception as e:
+            print(f"Failed to bump data versions: {e}")
+
+    def data_version(self, user_id: uuid.UUID) -> int:
+        """
+        Returns a counter, shared by all processes through Postgres, that
+        changes whenever any client writes or deletes the user's points.
+        """
+        return get_data_version(user_id)
+
+    def existing_point_ids(self, user_id: uuid.UUID, point_ids: List[str]) -> Set[str]:
+        """
+        Returns the subset of `point_ids` already stored for the user, fetching
+        only the owner field of each point.
+        """
+        if not point_ids:
+            return set()
+
+        records = self.client.retrieve(
+            collection_name=self.COLLECTION_NAME,
+            ids=point_ids,
+            with_payload=["user_id"],
+            with_vectors=False,
+        )
+        return {
+            str(record.id)
+            for record in records
+            if record.payload and record.payload.get("user_id") == str(user_id)
+        }
+
+    def delete_points(self, user_id: uuid.UUID, point_ids: List[str]):
+        """
+        Deletes points by id. The user_id condition keeps a caller from
+        deleting another user's points even with a valid id.
+        """
+        if not point_ids:
             return
 
-        self.client.upsert(
-            collection_name=self.COLLECTION_NAME, wait=True, points=points
+        self.client.delete(
+            collection_name=self.COLLECTION_NAME,
+            points_selector=models.FilterSelector(
+                filter=models.Filter(
+                    must=[
+                        models.HasIdCondition(has_id=point_ids),
+                        models.FieldCondition(
+                            key="user_id", match=models.MatchValue(value=str(user_id))
+                        ),
+                    ]
+                )
+            ),
+            wait=True,
+        )
+        self._bump_data_versions([user_id])
+        print(f"Deleted {len(point_ids)} points for user {user_id}")
+
+    def delete_legacy_chunks(self, user_id: uuid.UUID, texts: List[str]):
+        """
+        Deletes the user's points stored without a journal_entry_id whose text
+        is one of `texts`. Points written before chunk manifests only carry
+        user_id, text and created_at, so their text is the only way to find
+        them.
+        """
+        if not texts:
+            return
+
+        self.client.delete(
+            collection_name=self.COLLECTION_NAME,
+            points_selector=models.FilterSelector(
+                filter=models.Filter(
+                    must=[
+                        models.FieldCondition(
+                            key="user_id", match=models.MatchValue(value=str(user_id))
+                        ),
+                        models.FieldCondition(
+                            key="text", match=models.MatchAny(any=texts)
+                        ),
+                        models.IsEmptyCondition(
+                            is_empty=models.PayloadField(key="journal_entry_id")
+                        ),
+                    ]
+                )
+            ),
+            wait=True,
+        )
+        self._bump_data_versions([user_id])
+        print(f"Deleted legacy points of {len(texts)} chunks for user {user_id}")
+
+    def _use_hybrid(self, query_texts: Optional[List[str]]) -> bool:
+        return bool(
+            query_texts
+            and all(query_texts)
+            and self.sparse_enabled
+            and query_mode() == "hybrid"
         )
-        print(f"Upserted {len(points)} points for user {user_id}")
 
     def query(
-        self, user_id: uuid.UUID, query_embedding: List[float], top_k: int = 5
-    ) -> List[Dict[str, Any]]:
+        self,
+        user_id: uuid.UUID,
+        query_embedding: Union[List[float], np.ndarray],
+        top_k: int = 5,
+        query_text: Optional[str] = None,
+        payload_fields: Optional[Sequence[str]] = None,
+        with_vectors: bool = False,
+    ) -> List[RetrievedChunk]:
         """
         Performs a filtered query on Qdrant to retrieve chunks for a specific user.
+        Given the query text, dense and lexical matches are fused in one request.
+        Only the text and the `payload_fields` of each hit are fetched, plus
+        its vector if `with_vectors` is set.
         """
+        if self._use_hybrid([query_text]):
+            (response,) = self.client.query_batch_points(
+                collection_name=self.COLLECTION_NAME,
+                requests=[
+                    hybrid_query_request(
+                        user_id,
+                        query_embedding,
+                        query_text,
+                        top_k,
+                        self._sparse_encoder,
+                        payload_fields,
+                        with_vectors,
+                    )
+                ],
+            )
+            return to_retrieved_chunks(response.points)
+
         hits = self.client.search(
             collection_name=self.COLLECTION_NAME,
             query_vector=query_embedding,
-            query_filter=models.Filter(
-                must=[
-                    models.FieldCondition(
-                        key="user_id", match=models.MatchValue(value=str(user_id))
-                    )
-                ]
-            ),
+            query_filter=user_filter(user_id),
+            search_params=search_params(),
             limit=top_k,
+            with_payload=payload_selector(payload_fields),
+            with_vectors=vector_selector(with_vectors),
         )
 
-        return [hit.payload for hit in hits]
+        return to_retrieved_chunks(hits)
+
+    def query_batch(
+        self,
+        user_id: uuid.UUID,
+        embeddings: np.ndarray,
+        top_k: int = 5,
+        query_texts: Optional[List[str]] = None,
+        payload_fields: Optional[Sequence[str]] = None,
+        with_vectors: bool = False,
+    ) -> List[List[RetrievedChunk]]:
+        """
+        Runs one filtered search per row of a (n, dim) embedding array in a
+        single Qdrant request. Returns each query's hits, in order.
+        """
+        if query_texts is not None and len(query_texts) != len(embeddings):
+            raise ValueError(
+                f"Got {len(embeddings)} embeddings but {len(query_texts)} query texts."
+            )
+        if len(embeddings) == 0:
+            return []
+
+        if self._use_hybrid(query_texts):
+            responses = self.client.query_batch_points(
+                collection_name=self.COLLECTION_NAME,
+                requests=[
+                    hybrid_query_request(
+                        user_id,
+                        embedding,
+                        text,
+                        top_k,
+                        self._sparse_encoder,
+                        payload_fields,
+                        with_vectors,
+                    )
+                    for embedding, text in zip(embeddings, query_texts)
+                ],
+            )
+            return [to_retrieved_chunks(response.points) for response in responses]
+
+        query_filter = user_filter(user_id)
+        params = search_params()
+        results = self.client.search_batch(
+            collection_name=self.COLLECTION_NAME,
+            requests=[
+                models.SearchRequest(
+                    vector=vector,
+                    filter=query_filter,
+                    params=params,
+                    limit=top_k,
+                    with_payload=payload_selector(payload_fields),
+                    with_vector=vector_selector(with_vectors),
+                )
+                for vector in np.asarray(embeddings, dtype=np.float32).tolist()
+            ],
+        )
+        return [to_retrieved_chunks(hits) for hits in results]
@@ -0,0 +1,103 @@
+import os
+import uuid
+from typing import List, Optional, Sequence, Union
+
+import httpx
+import numpy as np
+from qdrant_client import AsyncQdrantClient
+
+from src.data_models.retrieval import RetrievedChunk
+from src.interfaces.async_vector_store_client import AsyncVectorStoreClient
+from src.text_processing.sparse import SparseTextEncoder
+from src.vector_store.clients.qdrant import (
+    SPARSE_VECTOR_NAME,
+    QdrantVectorStoreClient,
+    hybrid_query_request,
+    payload_selector,
+    query_mode,
+    search_params,
+    to_retrieved_chunks,
+    user_filter,
+    vector_selector,
+)
+
+
+class AsyncQdrantVectorStoreClient(AsyncVectorStoreClient):
+    """
+    Async counterpart of QdrantVectorStoreClient for the API's query path.
+    The collection itself is created and migrated by the sync client.
+    """
+
+    COLLECTION_NAME = QdrantVectorStoreClient.COLLECTION_NAME
+
+    def __init__(self):
+        qdrant_url = os.getenv("QDRANT_URL", "http://localhost:6333")
+        pool_size = int(os.getenv("QDRANT_POOL_SIZE", 32))
+        # One instance is shared by all requests. The client's default limits
+        # disable keep-alive, so every search would open a new connection.
+        self.client = AsyncQdrantClient(
+            url=qdrant_url,
+            prefer_grpc=os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true",
+            grpc_port=int(os.getenv("QDRANT_GRPC_PORT", 6334)),
+            limits=httpx.Limits(
+                max_connections=pool_size, max_keepalive_connections=pool_size
+            ),
+        )
+        self._sparse_encoder = SparseTextEncoder()
+        self._sparse_enabled: Optional[bool] = None
+
+    async def _has_sparse_vector(self) -> bool:
+        """Looks up once whether the collection stores the sparse vector."""
+        if self._sparse_enabled is None:
+            info = await self.client.get_collection(self.COLLECTION_NAME)
+            self._sparse_enabled = SPARSE_VECTOR_NAME in (
+                info.config.params.sparse_vectors or {}
+            )
+        return self._sparse_enabled
+
+    async def query(
+        self,
+        user_id: uuid.UUID,
+        query_embedding: Union[List[float], np.ndarray],
+        top_k: int = 5,
+        query_text: Optional[str] = None,
+        payload_fields: Optional[Sequence[str]] = None,
+        with_vectors: bool = False,
+    ) -> List[RetrievedChunk]:
+        """
+        Performs a filtered query on Qdrant to retrieve chunks for a specific user.
+        Given the query text, dense and lexical matches are fused in one request.
+        Only the text and the `payload_fields` of each hit are fetched, plus
+        its vector if `with_vectors` is set.
+        """
+        if query_text and query_mode() == "hybrid" and await self._has_sparse_vector():
+            (response,) = await self.client.query_batch_points(
+                collection_name=self.COLLECTION_NAME,
+                requests=[
+                    hybrid_query_request(
+                        user_id,
+                        query_embedding,
+                        query_text,
+                        top_k,
+                        self._sparse_encoder,
+                        payload_fields,
+                        with_vectors,
+                    )
+                ],
+            )
+            return to_retrieved_chunks(response.points)
+
+        hits = await self.client.search(
+            collection_name=self.COLLECTION_NAME,
+            query_vector=query_embedding,
+            query_filter=user_filter(user_id),
+            search_params=search_params(),
+            limit=top_k,
+            with_payload=payload_selector(payload_fields),
+            with_vectors=vector_selector(with_vectors),
+        )
+
+        return to_retrieved_chunks(hits)
+
+    async def close(self):
+        await self.client.close()
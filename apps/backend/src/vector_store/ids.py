@@ -0,0 +1,28 @@
+import hashlib
+import uuid
+
+from src.text_processing.chunking import chunk_hash
+
+# Fixed namespaces so ids stay stable across processes and deployments
+CHUNK_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "midjournal:journal-chunks")
+DOCUMENT_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "midjournal:documents")
+
+
+def point_id_for_chunk(user_id, source_id, chunk: str) -> str:
+    """
+    Returns the content-addressed point id of a chunk. The same chunk from the
+    same source of the same user always maps to the same point, which makes
+    upserts idempotent.
+    """
+    return str(
+        uuid.uuid5(CHUNK_ID_NAMESPACE, f"{user_id}:{source_id}:{chunk_hash(chunk)}")
+    )
+
+
+def document_id_for_text(user_id, text: str) -> str:
+    """
+    Returns a document id derived from the uploaded text, so re-uploading the
+    same file resolves to the same document and its existing points.
+    """
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return str(uuid.uuid5(DOCUMENT_ID_NAMESPACE, f"{user_id}:{text_hash}"))
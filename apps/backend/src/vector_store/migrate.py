@@ -0,0 +1,24 @@
+"""
+Applies the current collection configuration (HNSW, optimizer and quantization
+parameters, payload indexes) to an existing Qdrant collection.
+
+Usage (from apps/backend):
+    python -m src.vector_store.migrate
+"""
+
+from src.vector_store.clients.qdrant import QdrantVectorStoreClient
+
+
+def main():
+    # Constructing the client creates the collection if it is missing
+    client = QdrantVectorStoreClient()
+    client.migrate_collection()
+    info = client.client.get_collection(client.COLLECTION_NAME)
+    print(f"HNSW config: {info.config.hnsw_config}")
+    print(f"Sparse vectors: {info.config.params.sparse_vectors}")
+    print(f"Quantization config: {info.config.quantization_config}")
+    print(f"Payload indexes: {sorted(info.payload_schema)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Recall-vs-latency report for quantized search on the journal-chunks collection.
+
+Holds out a sample of stored chunks and uses their vectors as queries, each
+restricted to its owner like production searches and excluding the query point
+itself. Exact float32 search is the ground truth. Each oversampling factor is
+then measured with and without rescoring against the original vectors.
+
+Run after quantizing the collection with
+`QDRANT_QUANTIZATION=scalar python -m src.vector_store.migrate` (or `binary`).
+
+Usage (from apps/backend):
+    python -m src.vector_store.quantization_report --queries 200 --k 5
+"""
+
+import argparse
+import time
+from typing import List, Sequence
+
+import numpy as np
+from qdrant_client import models
+
+from src.vector_store.clients.qdrant import QdrantVectorStoreClient
+
+
+def _held_out_queries(client: QdrantVectorStoreClient, count: int):
+    """Returns a server-side random sample of stored points, with their vectors."""
+    return client.client.query_points(
+        collection_name=client.COLLECTION_NAME,
+        query=models.SampleQuery(sample=models.Sample.RANDOM),
+        limit=count,
+        with_payload=[client.TENANT_PAYLOAD_FIELD],
+        with_vectors=[""],
+    ).points
+
+
+def _search(
+    client: QdrantVectorStoreClient,
+    query: models.Record,
+    k: int,
+    params: models.SearchParams,
+) -> List:
+    # Selecting the default vector by name returns it as {"": [...]}.
+    vector = query.vector[""] if isinstance(query.vector, dict) else query.vector
+    return client.client.search(
+        collection_name=client.COLLECTION_NAME,
+        query_vector=vector,
+        query_filter=models.Filter(
+            must=[
+                models.FieldCondition(
+                    key=client.TENANT_PAYLOAD_FIELD,
+                    match=models.MatchValue(
+                        value=query.payload[client.TENANT_PAYLOAD_FIELD]
+                    ),
+                )
+            ],
+            must_not=[models.HasIdCondition(has_id=[query.id])],
+        ),
+        search_params=params,
+        limit=k,
+        with_payload=False,
+    )
+
+
+def _measure(client, queries, k, params, truth=None):
+    ids, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        hits = _search(client, query, k, params)
+        latencies.append(time.perf_counter() - start)
+        ids.append({hit.id for hit in hits})
+
+    result = {
+        "latency_p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "latency_p95_ms": float(np.percentile(latencies, 95) * 1000),
+    }
+    if truth is not None:
+        recalls = [
+            len(found & expected) / len(expected)
+            for found, expected in zip(ids, truth)
+            if expected
+        ]
+        result[f"recall_at_{k}"] = float(np.mean(recalls)) if recalls else 1.0
+    return ids, result
+
+
+def run_quantization_report(
+    queries: int = 200,
+    k: int = 5,
+    oversampling: Sequence[float] = (1.0, 2.0, 4.0),
+) -> List[dict]:
+    client = QdrantVectorStoreClient()
+    held_out = _held_out_queries(client, queries)
+
+    truth, exact = _measure(
+        client,
+        held_out,
+        k,
+        models.SearchParams(
+            exact=True,
+            quantization=models.QuantizationSearchParams(ignore=True),
+        ),
+    )
+    rows = [{"mode": "exact", "queries": len(held_out), **exact}]
+    for factor in oversampling:
+        for rescore in (False, True):
+            params = models.SearchParams(
+                quantization=models.QuantizationSearchParams(
+                    rescore=rescore, oversampling=factor
+                )
+            )
+            _, measured = _measure(client, held_out, k, params, truth)
+            rows.append(
+                {
+                    "mode": f"oversampling={factor:g} rescore={rescore}",
+                    "queries": len(held_out),
+                    **measured,
+                }
+            )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument(
+        "--oversampling", type=float, nargs="+", default=[1.0, 2.0, 4.0]
+    )
+    args = parser.parse_args()
+
+    rows = run_quantization_report(
+        queries=args.queries, k=args.k, oversampling=args.oversampling
+    )
+    for row in rows:
+        print(
+            ", ".join(
+                f"{name}: {value:.4f}"
+                if isinstance(value, float)
+                else f"{name}: {value}"
+                for name, value in row.items()
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
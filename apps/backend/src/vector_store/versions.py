@@ -0,0 +1,36 @@
+"""
+Per-user counters of vector store changes. They live in Postgres so that
+writes from the ingestion worker invalidate retrieval caches in every API
+worker, not only in the process that wrote.
+"""
+
+import uuid
+from typing import Iterable
+
+from sqlalchemy.dialects.postgresql import insert
+
+from src.db.database import SessionLocal
+from src.db.models import VectorDataVersion
+
+
+def bump_data_versions(user_ids: Iterable[uuid.UUID]):
+    """Increments the version of each user, creating missing rows."""
+    # Sorted, so concurrent bumps lock the rows in the same order
+    rows = [{"user_id": user_id, "version": 1} for user_id in sorted(set(user_ids))]
+    if not rows:
+        return
+    statement = insert(VectorDataVersion).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=[VectorDataVersion.user_id],
+        set_={"version": VectorDataVersion.version + 1},
+    )
+    with SessionLocal() as session:
+        session.execute(statement)
+        session.commit()
+
+
+def get_data_version(user_id: uuid.UUID) -> int:
+    """Returns the user's current version, 0 if their vectors never changed."""
+    with SessionLocal() as session:
+        version = session.get(VectorDataVersion, user_id)
+        return version.version if version is not None else 0
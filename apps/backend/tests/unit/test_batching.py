@@ -0,0 +1,32 @@
+import random
+
+from src.text_processing.batching import token_budget_batches
+
+
+def test_token_budget_batches_groups_longest_first_within_budget():
+    assert token_budget_batches([10, 50, 20, 40], max_tokens_per_batch=100) == [
+        [1, 3],
+        [2, 0],
+    ]
+
+
+def test_token_budget_batches_gives_an_oversized_item_its_own_batch():
+    assert token_budget_batches([500, 10, 30], max_tokens_per_batch=100) == [
+        [0],
+        [2, 1],
+    ]
+
+
+def test_token_budget_batches_of_nothing():
+    assert token_budget_batches([], max_tokens_per_batch=100) == []
+
+
+def test_token_budget_batches_covers_every_item_and_respects_the_budget():
+    rng = random.Random(0)
+    lengths = [rng.randint(1, 512) for _ in range(500)]
+
+    batches = token_budget_batches(lengths, max_tokens_per_batch=2048)
+
+    assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+    for batch in batches:
+        assert len(batch) * max(lengths[i] for i in batch) <= 2048
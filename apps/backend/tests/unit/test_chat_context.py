@@ -0,0 +1,66 @@
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+from src.data_models.retrieval import RetrievedChunk
+from src.query.context import ChatContextBuilder
+
+USER_ID = str(uuid.uuid4())
+
+
+def _hit(text, **payload):
+    return RetrievedChunk(id=text, score=1.0, text=text, payload=payload, vector=None)
+
+
+def _builder(hits, token_budget, summaries=None):
+    query_service = MagicMock()
+    query_service.aquery = AsyncMock(return_value=hits)
+    # One token per word
+    context_packer = MagicMock(token_budget=token_budget)
+    context_packer.count_tokens.side_effect = lambda texts: sum(
+        len(text.split()) for text in texts
+    )
+    builder = ChatContextBuilder(query_service, MagicMock(), context_packer)
+    builder.chunk_top_k, builder.summary_top_k = 5, 20
+    builder._entry_summaries = MagicMock(return_value=summaries or {})
+    return builder
+
+
+def _words(name, count):
+    return " ".join([name] * count)
+
+
+def test_top_chunks_that_fit_are_sent_even_when_all_candidates_do_not():
+    hits = [_hit(_words(f"doc{i}", 10), document_id="d") for i in range(20)]
+    builder = _builder(hits, token_budget=60)
+
+    context = asyncio.run(builder.build(USER_ID, "query"))
+
+    assert context == [hit.text for hit in hits[:5]]
+    builder._entry_summaries.assert_not_called()
+
+
+def test_entries_are_summarized_when_the_top_chunks_do_not_fit():
+    hits = [
+        _hit(_words("entry1-a", 30), journal_entry_id="e1"),
+        _hit(_words("entry2", 30), journal_entry_id="e2"),
+        _hit(_words("entry1-b", 30), journal_entry_id="e1"),
+    ] + [_hit(_words(f"doc{i}", 30), document_id="d") for i in range(10)]
+    builder = _builder(hits, token_budget=60, summaries={"e1": "Entry 1: summary"})
+
+    context = asyncio.run(builder.build(USER_ID, "query"))
+
+    # e1 once by its summary; e2 is unanalysed, so it and the documents keep
+    # their raw text, capped at chunk_top_k.
+    assert context == ["Entry 1: summary", hits[1].text] + [
+        hit.text for hit in hits[3:7]
+    ]
+
+
+def test_top_chunks_are_sent_when_no_entry_has_a_summary():
+    hits = [_hit(_words(f"doc{i}", 30), document_id="d") for i in range(6)]
+    builder = _builder(hits, token_budget=60)
+
+    context = asyncio.run(builder.build(USER_ID, "query"))
+
+    assert context == [hit.text for hit in hits[:5]]
@@ -0,0 +1,107 @@
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+# The service imports the text splitter, which needs langchain
+pytest.importorskip("langchain")
+
+from src.journal.service import JournalService  # noqa: E402
+from src.text_processing.chunking import chunk_hash  # noqa: E402
+from src.vector_store.ids import point_id_for_chunk  # noqa: E402
+
+USER_ID = uuid.uuid4()
+
+
+def _service():
+    text_processing_service = MagicMock()
+    # Entry content in these tests is its chunks joined by "|"
+    text_processing_service.split_text.side_effect = lambda text: text.split("|")
+    text_processing_service.embed_chunks.side_effect = lambda chunks: np.zeros(
+        (len(chunks), 384), dtype=np.float32
+    )
+    return JournalService(
+        db_session=MagicMock(),
+        mq_client=MagicMock(),
+        text_processing_service=text_processing_service,
+        vector_store_client=MagicMock(),
+    )
+
+
+def _entry(content, chunk_manifest):
+    return SimpleNamespace(
+        id=uuid.uuid4(), content=content, chunk_manifest=chunk_manifest
+    )
+
+
+def _point_id(entry, chunk):
+    return point_id_for_chunk(USER_ID, entry.id, chunk)
+
+
+def test_new_entry_embeds_every_chunk_once():
+    service = _service()
+    entry = _entry("first|second|first", {})
+
+    service._sync_entry_chunks(USER_ID, entry)
+
+    store = service.vector_store_client
+    store.add_embeddings.assert_called_once()
+    kwargs = store.add_embeddings.call_args.kwargs
+    assert kwargs["texts"] == ["first", "second"]
+    assert kwargs["ids"] == [_point_id(entry, "first"), _point_id(entry, "second")]
+    store.delete_points.assert_called_once_with(user_id=USER_ID, point_ids=[])
+    assert entry.chunk_manifest == {
+        chunk_hash("first"): _point_id(entry, "first"),
+        chunk_hash("second"): _point_id(entry, "second"),
+    }
+
+
+def test_edit_embeds_new_chunks_and_deletes_stale_ones():
+    service = _service()
+    entry = _entry(
+        "kept|added",
+        {chunk_hash("kept"): "kept-point", chunk_hash("removed"): "removed-point"},
+    )
+
+    service._sync_entry_chunks(USER_ID, entry, previous_content="kept|removed")
+
+    store = service.vector_store_client
+    assert store.add_embeddings.call_args.kwargs["texts"] == ["added"]
+    store.delete_points.assert_called_once_with(
+        user_id=USER_ID, point_ids=["removed-point"]
+    )
+    store.delete_legacy_chunks.assert_called_once_with(user_id=USER_ID, texts=[])
+    assert entry.chunk_manifest == {
+        chunk_hash("kept"): "kept-point",
+        chunk_hash("added"): _point_id(entry, "added"),
+    }
+
+
+def test_unchanged_chunks_are_neither_embedded_nor_deleted():
+    service = _service()
+    manifest = {chunk_hash("one"): "one-point", chunk_hash("two"): "two-point"}
+    entry = _entry("one|two", dict(manifest))
+
+    service._sync_entry_chunks(USER_ID, entry, previous_content="one|two")
+
+    store = service.vector_store_client
+    store.add_embeddings.assert_not_called()
+    service.text_processing_service.embed_chunks.assert_not_called()
+    store.delete_points.assert_called_once_with(user_id=USER_ID, point_ids=[])
+    assert entry.chunk_manifest == manifest
+
+
+def test_entry_without_manifest_deletes_its_old_chunks_by_text():
+    service = _service()
+    entry = _entry("new|shared", None)
+
+    service._sync_entry_chunks(USER_ID, entry, previous_content="old|shared")
+
+    store = service.vector_store_client
+    assert store.add_embeddings.call_args.kwargs["texts"] == ["new", "shared"]
+    store.delete_legacy_chunks.assert_called_once_with(
+        user_id=USER_ID, texts=["old", "shared"]
+    )
+    assert set(entry.chunk_manifest) == {chunk_hash("new"), chunk_hash("shared")}
@@ -0,0 +1,122 @@
+import numpy as np
+
+from src.data_models.retrieval import RetrievedChunk
+from src.query.postprocess import merge_overlapping, mmr_select
+
+
+def _unit(*values):
+    vector = np.asarray(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def _chunk(id, text="", score=1.0, vector=None, **payload):
+    return RetrievedChunk(id=id, score=score, text=text, payload=payload, vector=vector)
+
+
+def test_mmr_select_skips_near_duplicate_of_a_pick():
+    best = _chunk("best", score=1.0, vector=_unit(0.8, 0.6, 0))
+    duplicate = _chunk("duplicate", score=0.95, vector=_unit(0.79, 0.61, 0))
+    different = _chunk("different", score=0.9, vector=_unit(0.75, -0.66, 0))
+    tail = _chunk("tail", score=0.5, vector=_unit(0, 0, 1))
+
+    picked = mmr_select([best, duplicate, different, tail], k=4, lambda_=0.7)
+
+    assert [chunk.id for chunk in picked] == ["best", "different", "duplicate", "tail"]
+
+
+def test_mmr_select_with_lambda_one_keeps_score_order():
+    chunks = [
+        _chunk("a", score=0.6, vector=_unit(0.9, 0.1, 0)),
+        _chunk("b", score=0.2, vector=_unit(0.5, 0.5, 0)),
+        _chunk("c", score=0.8, vector=_unit(0.95, 0.05, 0)),
+    ]
+
+    picked = mmr_select(chunks, k=2, lambda_=1.0)
+
+    assert [chunk.id for chunk in picked] == ["c", "a"]
+
+
+def test_mmr_select_keeps_a_lexical_match_with_low_dense_similarity():
+    # Ranked second by hybrid fusion on its keywords, though its embedding is
+    # far from the query and the top hit, unlike the dense near-duplicate.
+    top = _chunk("top", score=1.0, vector=_unit(1, 0, 0))
+    lexical = _chunk("lexical", score=0.9, vector=_unit(0, 1, 0))
+    dense_duplicate = _chunk("dense-duplicate", score=0.8, vector=_unit(0.99, 0.1, 0))
+    tail = _chunk("tail", score=0.1, vector=_unit(0.9, 0, 0.4))
+
+    picked = mmr_select([top, lexical, dense_duplicate, tail], k=2)
+
+    assert [chunk.id for chunk in picked] == ["top", "lexical"]
+
+
+def test_mmr_select_puts_chunks_without_vectors_last_and_truncates():
+    chunks = [
+        _chunk("no-vector", score=1.0),
+        _chunk("a", score=0.9, vector=_unit(0.9, 0.1, 0)),
+        _chunk("b", score=0.5, vector=_unit(0.1, 0.9, 0)),
+    ]
+
+    assert [chunk.id for chunk in mmr_select(chunks, k=3)] == [
+        "a",
+        "b",
+        "no-vector",
+    ]
+    assert [chunk.id for chunk in mmr_select(chunks, k=1)] == ["a"]
+
+
+def test_mmr_select_with_one_vector_keeps_order():
+    chunks = [_chunk("a", vector=_unit(1, 0, 0)), _chunk("no-vector")]
+
+    assert mmr_select(chunks, k=5) == chunks
+
+
+OVERLAP = "the overlapping part of both chunks "
+
+
+def test_merge_overlapping_joins_continuing_chunks_of_a_source():
+    first = _chunk("1", "Start of the entry, " + OVERLAP, 0.9, journal_entry_id="e")
+    second = _chunk("2", OVERLAP + "and its end.", 0.95, journal_entry_id="e")
+
+    merged = merge_overlapping([first, second])
+
+    assert len(merged) == 1
+    assert merged[0].id == "1"
+    assert merged[0].score == 0.95
+    assert merged[0].text == "Start of the entry, " + OVERLAP + "and its end."
+
+
+def test_merge_overlapping_joins_a_chunk_that_precedes_a_kept_one():
+    later = _chunk("later", OVERLAP + "and its end.", journal_entry_id="e")
+    earlier = _chunk("earlier", "Start of the entry, " + OVERLAP, journal_entry_id="e")
+
+    merged = merge_overlapping([later, earlier])
+
+    assert [chunk.id for chunk in merged] == ["later"]
+    assert merged[0].text == "Start of the entry, " + OVERLAP + "and its end."
+
+
+def test_merge_overlapping_joins_runs_of_chunks():
+    other = "a second overlap between chunks two and three "
+    chunks = [
+        _chunk("3", other + "end.", document_id="d"),
+        _chunk("1", "start, " + OVERLAP, document_id="d"),
+        _chunk("2", OVERLAP + "middle, " + other, document_id="d"),
+    ]
+
+    merged = merge_overlapping(chunks)
+
+    assert len(merged) == 1
+    assert merged[0].text == "start, " + OVERLAP + "middle, " + other + "end."
+
+
+def test_merge_overlapping_keeps_chunks_apart_across_sources_or_short_overlaps():
+    chunks = [
+        _chunk("1", "Start, " + OVERLAP, journal_entry_id="e1"),
+        _chunk("2", OVERLAP + "end.", journal_entry_id="e2"),
+        _chunk("3", "no source " + OVERLAP),
+        _chunk("4", OVERLAP + "no source either."),
+        _chunk("5", "short overlap", journal_entry_id="e3"),
+        _chunk("6", "overlap here", journal_entry_id="e3"),
+    ]
+
+    assert merge_overlapping(chunks) == chunks
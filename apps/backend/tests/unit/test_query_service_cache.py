@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+# The service imports the text splitter, which needs langchain
+pytest.importorskip("langchain")
+
+from src.data_models.retrieval import RetrievedChunk  # noqa: E402
+from src.query.cache import RetrievalCache  # noqa: E402
+from src.query.service import QueryServiceImpl  # noqa: E402
+
+USER_ID = str(uuid.uuid4())
+
+
+def _service(retrieval_cache=None):
+    embedding_service = MagicMock()
+    embedding_service.generate_embedding.return_value = np.ones(4, np.float32)
+    embedding_service.agenerate_embedding = AsyncMock(
+        return_value=np.ones(4, np.float32)
+    )
+    hit = RetrievedChunk(id="a", score=1.0, text="a", payload={}, vector=None)
+    vector_store_client = MagicMock()
+    vector_store_client.query.return_value = [hit]
+    vector_store_client.data_version.return_value = 7
+    async_vector_store_client = MagicMock()
+    async_vector_store_client.query = AsyncMock(return_value=[hit])
+    return QueryServiceImpl(
+        embedding_service,
+        vector_store_client,
+        async_vector_store_client,
+        retrieval_cache=retrieval_cache,
+    )
+
+
+def test_no_cache_never_reads_the_data_version():
+    service = _service()
+
+    service.query(USER_ID, "query")
+
+    service.vector_store_client.data_version.assert_not_called()
+
+
+def test_second_query_is_served_from_the_cache():
+    service = _service(RetrievalCache(max_entries=10, ttl_seconds=60))
+
+    service.query(USER_ID, "query")
+    service.query(USER_ID, "query")
+
+    assert service.vector_store_client.query.call_count == 1
+
+
+def test_failed_version_read_is_a_cache_miss():
+    cache = RetrievalCache(max_entries=10, ttl_seconds=60)
+    service = _service(cache)
+    service.vector_store_client.data_version.side_effect = ConnectionError("down")
+
+    assert [hit.id for hit in service.query(USER_ID, "query")] == ["a"]
+    service.query(USER_ID, "query")
+
+    assert service.vector_store_client.query.call_count == 2
+
+
+def test_aquery_reads_the_version_off_the_event_loop():
+    service = _service(RetrievalCache(max_entries=10, ttl_seconds=60))
+    read_threads = []
+
+    def data_version(user_id):
+        read_threads.append(threading.current_thread())
+        return 7
+
+    service.vector_store_client.data_version.side_effect = data_version
+
+    async def run():
+        await service.aquery(USER_ID, "query")
+        return await service.aquery(USER_ID, "query")
+
+    assert [hit.id for hit in asyncio.run(run())] == ["a"]
+    assert read_threads and threading.main_thread() not in read_threads
+    assert service.async_vector_store_client.query.call_count == 1
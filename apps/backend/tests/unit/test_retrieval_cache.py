@@ -0,0 +1,78 @@
+import pytest
+
+from src.data_models.retrieval import RetrievedChunk
+from src.query import cache as cache_module
+from src.query.cache import RetrievalCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    return clock
+
+
+def _hits(*ids):
+    return [
+        RetrievedChunk(id=id, score=1.0, text=id, payload={}, vector=None) for id in ids
+    ]
+
+
+def test_hit_for_the_same_user_version_query_and_top_k(clock):
+    cache = RetrievalCache(max_entries=10, ttl_seconds=60)
+    cache.put("user", 1, "What did I do today?", 5, _hits("a", "b"))
+
+    assert [hit.id for hit in cache.get("user", 1, "what did  I do today?", 5)] == [
+        "a",
+        "b",
+    ]
+    assert cache.get("user", 2, "What did I do today?", 5) is None
+    assert cache.get("other", 1, "What did I do today?", 5) is None
+    assert cache.get("user", 1, "What did I do today?", 3) is None
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = RetrievalCache(max_entries=10, ttl_seconds=60)
+    cache.put("user", 1, "query", 5, _hits("a"))
+
+    clock.now += 60
+    assert cache.get("user", 1, "query", 5) is not None
+    clock.now += 1
+    assert cache.get("user", 1, "query", 5) is None
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = RetrievalCache(max_entries=2, ttl_seconds=60)
+    cache.put("user", 1, "first", 5, _hits("a"))
+    cache.put("user", 1, "second", 5, _hits("b"))
+    assert cache.get("user", 1, "first", 5) is not None
+
+    cache.put("user", 1, "third", 5, _hits("c"))
+
+    assert cache.get("user", 1, "second", 5) is None
+    assert cache.get("user", 1, "first", 5) is not None
+    assert cache.get("user", 1, "third", 5) is not None
+
+
+def test_returned_lists_are_copies(clock):
+    cache = RetrievalCache(max_entries=10, ttl_seconds=60)
+    cache.put("user", 1, "query", 5, _hits("a"))
+
+    cache.get("user", 1, "query", 5).clear()
+
+    assert len(cache.get("user", 1, "query", 5)) == 1
+
+
+def test_zero_max_entries_disables_the_cache(clock):
+    cache = RetrievalCache(max_entries=0, ttl_seconds=60)
+    cache.put("user", 1, "query", 5, _hits("a"))
+
+    assert cache.get("user", 1, "query", 5) is None